@@ -6,6 +6,7 @@ This demonstrates basic usage patterns. For more examples, see:
 - verify_all_components.py - Component verification
 - tests/ - Comprehensive test suite
 """
+import logging
 import os
 from dotenv import load_dotenv
 from src.workflow import GameTheoryRAG
@@ -40,4 +41,6 @@ def run_example():
 
 
 if __name__ == "__main__":
+    # Show the workflow's node and routing trace
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     run_example()
@@ -6,9 +6,11 @@ Usage:
     python query.py "What is Nash equilibrium?"
     python query.py "Explain the prisoner's dilemma"
     python query.py --interactive  # Interactive mode
+    python query.py -v "What is Nash equilibrium?"  # Show workflow trace
 """
 import sys
 import argparse
+import logging
 from src.workflow import GameTheoryRAG
 
 
@@ -23,6 +25,7 @@ Examples:
   python3 %(prog)s "Explain the prisoner's dilemma"
   python3 %(prog)s --interactive
   python3 %(prog)s -i
+  python3 %(prog)s -v "What is Nash equilibrium?"
         """
     )
     
@@ -38,8 +41,21 @@ Examples:
         help='Run in interactive mode (ask multiple questions)'
     )
     
+    parser.add_argument(
+        '-v', '--verbose',
+        action='count',
+        default=0,
+        help='Show workflow progress (-v for nodes and routing, -vv for details)'
+    )
+    
     args = parser.parse_args()
     
+    log_levels = {0: logging.WARNING, 1: logging.INFO}
+    logging.basicConfig(
+        level=log_levels.get(args.verbose, logging.DEBUG),
+        format="%(message)s"
+    )
+    
     # Initialize the RAG system
     try:
         rag = GameTheoryRAG(
@@ -27,6 +27,7 @@ Search Behavior:
     - Query string supports arxiv search syntax
 """
 import arxiv
+from itertools import islice
 from typing import List, Dict, Any, Optional
 import os
 
@@ -123,9 +124,9 @@ class ArxivSearcher:
             sort_by=arxiv.SortCriterion.Relevance
         )
         
-        papers = []
-        for result in search.results():
-            paper_data = {
+        # results() is a lazy generator; never pull more than max_results
+        return [
+            {
                 "title": result.title,
                 "summary": result.summary,
                 "authors": [author.name for author in result.authors],
@@ -133,9 +134,8 @@ class ArxivSearcher:
                 "pdf_url": result.pdf_url,
                 "entry_id": result.entry_id
             }
-            papers.append(paper_data)
-            
-        return papers
+            for result in islice(search.results(), self.max_results)
+        ]
     
     def download_paper(
         self,
@@ -23,10 +23,23 @@ Sentence Boundary Detection:
     When possible, chunks are broken at sentence boundaries within 100
     characters of the target size. This keeps sentences intact, improving
     readability and semantic coherence of retrieved chunks.
+
+Fast Path:
+    If the optional semantic-text-splitter package (Rust) is installed and
+    use_fast_splitter=True, process_papers() chunks all papers in one
+    parallel call instead of a Python loop per paper. Chunk boundaries differ
+    slightly from the built-in algorithm, so the fast path is opt-in to keep
+    chunk IDs stable for existing databases.
 """
 from typing import List, Dict, Any
 import re
 
+# Optional Rust-backed splitter for batch chunking
+try:
+    from semantic_text_splitter import TextSplitter
+except ImportError:
+    TextSplitter = None  # Fast path unavailable; built-in chunker is used
+
 
 class DocumentProcessor:
     """
@@ -54,7 +67,12 @@ class DocumentProcessor:
             # Returns list of chunk dicts with text, metadata, and id
     """
     
-    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        use_fast_splitter: bool = False
+    ):
         """
         Initialize document processor.
         
@@ -67,6 +85,10 @@ class DocumentProcessor:
                 chunks. Default is 200. Overlap ensures context continuity and
                 prevents information loss at boundaries. Should be less than
                 chunk_size.
+            use_fast_splitter: If True and semantic-text-splitter is installed,
+                process_papers() uses its Rust batch chunker. Falls back to
+                the built-in chunker when the package is missing. Default is
+                False.
         
         Note:
             - chunk_overlap should be less than chunk_size
@@ -76,6 +98,9 @@ class DocumentProcessor:
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self._splitter = None
+        if use_fast_splitter and TextSplitter is not None:
+            self._splitter = TextSplitter(chunk_size, overlap=chunk_overlap)
     
     def chunk_text(self, text: str) -> List[str]:
         """
@@ -211,29 +236,84 @@ class DocumentProcessor:
             - pdf_url is stored in metadata if available, enabling downstream PDF processing
             - All chunks from the same paper share the same pdf_url
         """
-        # Combine title and summary for chunking
-        full_text = f"Title: {paper_data['title']}\n\nAbstract: {paper_data['summary']}"
+        return self._build_chunks(paper_data, self.chunk_text(self._paper_text(paper_data)))
+    
+    def process_papers(
+        self,
+        papers: List[Dict[str, Any]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Process several papers into chunks with metadata.
+        
+        Equivalent to calling process_paper on each paper, but when the fast
+        splitter is enabled all texts are chunked in a single batched call
+        that runs in parallel outside the GIL.
+        
+        Args:
+            papers: List of paper dictionaries (see process_paper for keys).
+        
+        Returns:
+            List with one entry per input paper (same order), each being the
+            list of chunk dictionaries process_paper would return.
+        
+        Raises:
+            KeyError: If any paper is missing a required key.
+        """
+        texts = [self._paper_text(paper) for paper in papers]
+        if self._splitter is not None:
+            cleaned = [re.sub(r'\s+', ' ', text).strip() for text in texts]
+            all_chunks = self._splitter.chunk_all(cleaned)
+        else:
+            all_chunks = [self.chunk_text(text) for text in texts]
+        return [
+            self._build_chunks(paper, chunks)
+            for paper, chunks in zip(papers, all_chunks)
+        ]
+    
+    @staticmethod
+    def chunk_id(entry_id: str, index: int) -> str:
+        """
+        Build the ID of a paper chunk.
         
-        chunks = self.chunk_text(full_text)
+        Args:
+            entry_id: Arxiv entry ID or source identifier of the paper.
+            index: Zero-based chunk index within the paper.
+        
+        Returns:
+            Chunk ID in the format "{entry_id}_chunk_{index}".
+        """
+        return f"{entry_id}_chunk_{index}"
+    
+    def _paper_text(self, paper_data: Dict[str, Any]) -> str:
+        """Combine title and summary into the text that gets chunked."""
+        return f"Title: {paper_data['title']}\n\nAbstract: {paper_data['summary']}"
+    
+    def _build_chunks(
+        self,
+        paper_data: Dict[str, Any],
+        chunks: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Attach metadata and IDs to a paper's text chunks."""
+        # Paper-level metadata is the same for every chunk; build it once
+        base_metadata = {
+            "title": paper_data["title"],
+            "authors": ", ".join(paper_data["authors"]),
+            "published": paper_data["published"],
+            "source": paper_data["entry_id"]
+        }
+        # Add pdf_url if available (enables PDF download workflows)
+        if "pdf_url" in paper_data and paper_data["pdf_url"]:
+            base_metadata["pdf_url"] = paper_data["pdf_url"]
         
         processed_chunks = []
         for i, chunk in enumerate(chunks):
-            # Build metadata dictionary
-            metadata = {
-                "title": paper_data["title"],
-                "authors": ", ".join(paper_data["authors"]),
-                "published": paper_data["published"],
-                "source": paper_data["entry_id"],
-                "chunk_index": i
-            }
-            # Add pdf_url if available (enables PDF download workflows)
-            if "pdf_url" in paper_data and paper_data["pdf_url"]:
-                metadata["pdf_url"] = paper_data["pdf_url"]
+            # Each chunk gets its own dict (Chroma stores one per document)
+            metadata = {**base_metadata, "chunk_index": i}
             
             chunk_data = {
                 "text": chunk,
                 "metadata": metadata,
-                "id": f"{paper_data['entry_id']}_chunk_{i}"
+                "id": self.chunk_id(paper_data["entry_id"], i)
             }
             processed_chunks.append(chunk_data)
         
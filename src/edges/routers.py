@@ -11,6 +11,7 @@ All routing functions follow the pattern:
 They return string literals that map to node names in the workflow graph.
 These return values must match the node names exactly for proper routing.
 """
+import logging
 from typing import Literal, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -18,6 +19,8 @@ if TYPE_CHECKING:
 else:
     from src.state import GraphState
 
+logger = logging.getLogger(__name__)
+
 
 def route_after_relevance_check(
     state: GraphState
@@ -63,12 +66,12 @@ def route_after_relevance_check(
     num_docs = len(chroma_results.get("documents", [[]])[0]) if chroma_results.get("documents") else 0
     
     if relevant:
-        print(f"→ ROUTING: Context is RELEVANT → routing to 'generate_response'")
-        print(f"  Reason: Retrieved {num_docs} document(s) are sufficient to answer the query")
+        logger.info("→ ROUTING: Context is RELEVANT → routing to 'generate_response'")
+        logger.debug("  Reason: Retrieved %s document(s) are sufficient to answer the query", num_docs)
         return "generate_response"
     else:
-        print(f"→ ROUTING: Context is NOT RELEVANT (or missing) → routing to 'search_arxiv'")
-        print(f"  Reason: Retrieved {num_docs} document(s) insufficient, searching arxiv with 'game theory' prefix")
+        logger.info("→ ROUTING: Context is NOT RELEVANT (or missing) → routing to 'search_arxiv'")
+        logger.debug("  Reason: Retrieved %s document(s) insufficient, searching arxiv with 'game theory' prefix", num_docs)
         return "search_arxiv"
 
 
@@ -108,17 +111,17 @@ def route_after_paper_filter(
     papers_seen = state.get("papers_seen", [])
     
     if papers:
-        print(f"→ ROUTING: Found {len(papers)} NEW game theory paper(s) → routing to 'add_to_chroma'")
-        print(f"  Reason: Papers will be added to vector DB and workflow will loop back to retrieve them")
+        logger.info("→ ROUTING: Found %s NEW game theory paper(s) → routing to 'add_to_chroma'", len(papers))
+        logger.debug("  Reason: Papers will be added to vector DB and workflow will loop back to retrieve them")
         return "add_to_chroma"
     else:
         # No new game theory papers found
         if num_docs == 0:
-            print(f"→ ROUTING: No game theory papers found (checked {len(papers_seen)} total) AND no vector DB results → routing to 'generate_response'")
-            print(f"  Reason: Query appears to not be game theory related or no relevant papers exist")
+            logger.info("→ ROUTING: No game theory papers found (checked %s total) AND no vector DB results → routing to 'generate_response'", len(papers_seen))
+            logger.debug("  Reason: Query appears to not be game theory related or no relevant papers exist")
             return "generate_response"
         else:
             # Have vector DB results but no new papers to add - use what we have
-            print(f"→ ROUTING: No new game theory papers (already seen {len(papers_seen)}), but have {num_docs} vector DB result(s) → routing to 'generate_response'")
-            print(f"  Reason: Will use existing vector DB results for response (no new papers to add)")
+            logger.info("→ ROUTING: No new game theory papers (already seen %s), but have %s vector DB result(s) → routing to 'generate_response'", len(papers_seen), num_docs)
+            logger.debug("  Reason: Will use existing vector DB results for response (no new papers to add)")
             return "generate_response"
@@ -13,6 +13,7 @@ create node wrappers with dependencies injected.
 from inspect import signature
 from typing import get_type_hints, Callable, Dict, Any, Optional
 from functools import wraps
+from langchain_core.runnables import RunnableLambda
 
 
 class WorkflowBuilder:
@@ -80,7 +81,11 @@ class WorkflowBuilder:
         
         self.dependencies = dependencies
     
-    def create_node(self, node_func: Callable) -> Callable:
+    def create_node(
+        self,
+        node_func: Callable,
+        async_node_func: Optional[Callable] = None
+    ) -> Callable:
         """
         Create a node wrapper with dependencies automatically injected.
         
@@ -96,11 +101,17 @@ class WorkflowBuilder:
                 - First parameter named 'state' of type GraphState
                 - Additional parameters with type hints matching dependency keys
                 - Return type GraphState
+            async_node_func: Optional ``async def`` variant of node_func with
+                the same contract. When given, the graph runs it under
+                ``ainvoke``/``astream`` and node_func under ``invoke``/``stream``.
+                Without it, LangGraph runs node_func in a thread pool for
+                async execution.
         
         Returns:
             Wrapped function with signature (state: GraphState) -> GraphState.
             When called, it automatically injects dependencies and calls the
-            original node_func.
+            original node_func. If async_node_func is given, a RunnableLambda
+            wrapping both variants is returned instead.
         
         Raises:
             ValueError: If required dependencies are not found in registry.
@@ -118,6 +129,45 @@ class WorkflowBuilder:
                 
                 # wrapped(state) automatically passes my_llm as llm parameter
         """
+        node_deps = self._resolve_dependencies(node_func)
+        
+        # Create wrapper function
+        @wraps(node_func)
+        def wrapper(state):
+            """
+            Wrapper that injects dependencies and calls the original node function.
+            
+            This wrapper is called by LangGraph with just the state, and it
+            automatically passes the appropriate dependencies to the node function.
+            """
+            return node_func(state, **node_deps)
+        
+        if async_node_func is None:
+            return wrapper
+        
+        async_deps = self._resolve_dependencies(async_node_func)
+        
+        @wraps(async_node_func)
+        async def async_wrapper(state):
+            """Async counterpart of wrapper, used when the graph runs via ainvoke."""
+            return await async_node_func(state, **async_deps)
+        
+        return RunnableLambda(wrapper, afunc=async_wrapper, name=node_func.__name__)
+    
+    def _resolve_dependencies(self, node_func: Callable) -> Dict[str, Any]:
+        """
+        Match a node function's parameters to instances in the registry.
+        
+        Args:
+            node_func: The node function whose dependencies should be resolved.
+        
+        Returns:
+            Dictionary mapping parameter names to dependency instances.
+        
+        Raises:
+            ValueError: If required dependencies are not found in registry.
+            TypeError: If a parameter is missing its type hint.
+        """
         # Get function signature and type hints
         sig = signature(node_func)
         hints = get_type_hints(node_func)
@@ -163,18 +213,7 @@ class WorkflowBuilder:
                 f"  Available: {available}"
             )
         
-        # Create wrapper function
-        @wraps(node_func)
-        def wrapper(state):
-            """
-            Wrapper that injects dependencies and calls the original node function.
-            
-            This wrapper is called by LangGraph with just the state, and it
-            automatically passes the appropriate dependencies to the node function.
-            """
-            return node_func(state, **node_deps)
-        
-        return wrapper
+        return node_deps
     
     def get_dependencies(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,285 @@
+"""
+Micro-batching wrapper for LLM calls.
+
+This module provides the LLMBatcher class, which collects LLM requests issued
+concurrently from different threads (e.g. several GameTheoryRAG.query() calls
+running at once) and sends them to the model as a single batched call.
+
+The classifier nodes (check_needs_context, check_relevance) issue short
+prompts with a near-identical prefix; batching them lets a serving backend
+process many requests in one pass instead of one request at a time.
+"""
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import queue
+import threading
+import time
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import ensure_config
+
+
+class LLMBatcher:
+    """
+    Collect concurrent LLM requests and send them as one batched call.
+    
+    Callers submit a prompt with invoke() and block until its response is
+    ready (or await ainvoke() from async code). A background worker thread
+    takes the first pending prompt. If nothing else is queued it is sent at
+    once; otherwise the worker waits up to ``wait_ms`` milliseconds for more
+    to arrive (at most ``max_batch`` in total), then sends them all with
+    ``llm.batch()`` and hands each response back to its caller.
+    
+    A single query running on its own therefore pays no extra latency.
+    The throughput gain comes when several queries run at the same time:
+    requests that arrive while a call is in flight share the next batch.
+    
+    Each request carries its caller's RunnableConfig (including the
+    callbacks of the surrounding run), so LLM calls made on the worker
+    thread still appear under the caller's trace.
+    
+    Example:
+        .. code-block:: python
+        
+            batcher = LLMBatcher.for_llm(llm)
+            prompt_value = prompt.invoke({"query": "What is Nash equilibrium?"})
+            response = batcher.invoke(prompt_value)
+            print(response.content)
+    
+    Attributes:
+        llm: The wrapped chat model.
+        max_batch: Maximum number of prompts sent in a single batch.
+        wait_ms: How long to wait for more prompts when several are pending.
+        max_tokens: Output token limit passed with every call, or None to
+            use the model's own setting.
+    """
+    
+    # Batchers shared per LLM instance, so concurrent queries through
+    # different GameTheoryRAG instances using the same model batch together.
+    # Bounded like GameTheoryRAG._compiled_workflows; evicted batchers are
+    # closed so their worker threads (and models) can be released.
+    _shared: Dict[Tuple[int, Optional[int]], Tuple[BaseChatModel, "LLMBatcher"]] = {}
+    _shared_lock = threading.Lock()
+    _MAX_SHARED = 8
+    
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        max_batch: int = 32,
+        wait_ms: float = 20,
+        max_tokens: Optional[int] = None
+    ):
+        """
+        Initialize the batcher.
+        
+        The worker thread is started on the first call to invoke().
+        
+        Args:
+            llm: Chat model to send batched requests to.
+            max_batch: Maximum number of prompts per batch. Default is 32.
+            wait_ms: Milliseconds to wait for more prompts once a batch has
+                more than one pending prompt. A lone prompt is sent
+                immediately. Default is 20.
+            max_tokens: If set, passed as ``max_tokens`` on every LLM call to
+                cap the output length (e.g. 1 for yes/no classifiers). The
+                model must accept this keyword. Default is None.
+        
+        Raises:
+            ValueError: If max_batch is less than 1 or wait_ms is negative.
+        """
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if wait_ms < 0:
+            raise ValueError("wait_ms cannot be negative")
+        
+        self.llm = llm
+        self.max_batch = max_batch
+        self.wait_ms = wait_ms
+        self.max_tokens = max_tokens
+        self._call_kwargs = {} if max_tokens is None else {"max_tokens": max_tokens}
+        # None is a stop request for the worker (see close)
+        self._queue: "queue.Queue[Optional[Tuple[Any, RunnableConfig, Future]]]" = queue.Queue()
+        self._worker = None
+        self._worker_lock = threading.Lock()
+    
+    @classmethod
+    def for_llm(
+        cls,
+        llm: BaseChatModel,
+        max_tokens: Optional[int] = None
+    ) -> "LLMBatcher":
+        """
+        Return the shared batcher for an LLM instance, creating it if needed.
+        
+        Args:
+            llm: Chat model the batcher should wrap.
+            max_tokens: Output token limit for the batcher (see __init__).
+        
+        At most ``_MAX_SHARED`` batchers are kept; when full, the oldest is
+        dropped and closed. Callers still holding it can keep using it.
+        
+        Returns:
+            LLMBatcher instance shared by every caller using this llm with
+            the same max_tokens.
+        """
+        key = (id(llm), max_tokens)
+        with cls._shared_lock:
+            entry = cls._shared.get(key)
+            if entry is None:
+                if len(cls._shared) >= cls._MAX_SHARED:
+                    # Evict the oldest entry (dicts preserve insertion order)
+                    oldest = next(iter(cls._shared))
+                    cls._shared.pop(oldest)[1].close()
+                # Keep a reference to llm so its id cannot be reused
+                entry = (llm, cls(llm, max_tokens=max_tokens))
+                cls._shared[key] = entry
+            return entry[1]
+    
+    def invoke(self, prompt_value: Any, config: Optional[RunnableConfig] = None) -> BaseMessage:
+        """
+        Submit a prompt and wait for its response.
+        
+        Args:
+            prompt_value: Any input accepted by ``llm.invoke()``, typically
+                the result of ``ChatPromptTemplate.invoke()``.
+            config: Optional RunnableConfig for the LLM call. It is merged
+                with the config of the run this is called from (e.g. the
+                current LangGraph node), as ``llm.invoke()`` would do.
+        
+        Returns:
+            The LLM's response message for this prompt.
+        
+        Raises:
+            Exception: Whatever the LLM raised for this prompt.
+        """
+        return self._submit(prompt_value, config).result()
+    
+    async def ainvoke(
+        self,
+        prompt_value: Any,
+        config: Optional[RunnableConfig] = None
+    ) -> BaseMessage:
+        """
+        Submit a prompt and await its response without blocking the event loop.
+        
+        Requests from coroutines and threads share the same batches.
+        
+        Args:
+            prompt_value: Any input accepted by ``llm.invoke()``.
+            config: Optional RunnableConfig for the LLM call (see invoke).
+        
+        Returns:
+            The LLM's response message for this prompt.
+        
+        Raises:
+            Exception: Whatever the LLM raised for this prompt.
+        """
+        return await asyncio.wrap_future(self._submit(prompt_value, config))
+    
+    def _submit(self, prompt_value: Any, config: Optional[RunnableConfig]) -> Future:
+        """Queue a prompt for the worker and return its pending Future."""
+        future: Future = Future()
+        # Resolve the config here, in the caller's context: the worker thread
+        # does not see the caller's current run, so its callbacks must travel
+        # with the request
+        self._queue.put((prompt_value, ensure_config(config), future))
+        self._ensure_worker()
+        return future
+    
+    def close(self) -> None:
+        """
+        Stop the worker thread once the requests already queued are answered.
+        
+        The batcher stays usable: a later invoke() starts a new worker.
+        """
+        with self._worker_lock:
+            if self._worker is not None:
+                self._queue.put(None)
+                self._worker = None
+    
+    def _ensure_worker(self) -> None:
+        """Start the background worker thread if it is not running."""
+        if self._worker is not None:
+            return
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="LLMBatcher", daemon=True
+                )
+                self._worker.start()
+    
+    def _collect(self) -> Optional[List[Tuple[Any, RunnableConfig, Future]]]:
+        """
+        Block for the first pending prompt. If others are already queued,
+        gather more until the batch is full or the wait window closes.
+        
+        Futures whose callers already gave up (e.g. an ainvoke cancelled by a
+        timeout) are dropped; the rest are marked running so they can no
+        longer be cancelled.
+        
+        Returns:
+            The batch, or None if the worker was asked to stop.
+        """
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        # A lone request goes out at once; only wait when requests are
+        # clearly arriving concurrently
+        if not self._queue.empty():
+            deadline = time.monotonic() + self.wait_ms / 1000
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    # Send this batch first; the stop request is handled next
+                    self._queue.put(None)
+                    break
+                batch.append(request)
+        return [request for request in batch if request[2].set_running_or_notify_cancel()]
+    
+    def _run(self) -> None:
+        """
+        Worker loop: collect a batch, call the LLM, resolve the futures.
+        
+        The loop ends only on a stop request from close(). Nothing raised
+        here may escape it: a worker that died otherwise would not be
+        restarted and would leave every later call waiting.
+        """
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            if not batch:
+                continue
+            inputs = [prompt_value for prompt_value, _, _ in batch]
+            configs = [config for _, config, _ in batch]
+            try:
+                if len(inputs) == 1:
+                    results = [
+                        self.llm.invoke(inputs[0], config=configs[0], **self._call_kwargs)
+                    ]
+                else:
+                    results = self.llm.batch(
+                        inputs, config=configs, return_exceptions=True,
+                        **self._call_kwargs
+                    )
+            except Exception as e:
+                results = [e] * len(batch)
+            
+            for (_, _, future), result in zip(batch, results):
+                try:
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                except InvalidStateError:
+                    pass  # Already resolved; the caller has stopped waiting
@@ -7,6 +7,9 @@ This package contains all node functions organized by concern:
 - processing_nodes: Document processing and storage
 - response_nodes: Response generation
 
+LLM-bound nodes also have ``async def`` variants (prefixed with ``a``) that
+are used when the workflow runs via ``ainvoke``.
+
 All nodes follow a functional pattern:
     (state: GraphState, ...dependencies) -> GraphState
 
@@ -15,7 +18,8 @@ what tools each node requires to operate.
 """
 from .context_nodes import (
     check_needs_context,
-    check_relevance
+    check_relevance,
+    acheck_relevance
 )
 from .retrieval_nodes import (
     pull_from_chroma,
@@ -25,24 +29,29 @@ from .processing_nodes import (
     add_to_chroma
 )
 from .response_nodes import (
-    generate_response
+    generate_response,
+    agenerate_response
 )
 from .pdf_nodes import (
     extract_pdf_urls_from_results,
     download_pdfs_from_state
 )
 from .filter_nodes import (
-    filter_game_theory_papers
+    filter_game_theory_papers,
+    afilter_game_theory_papers
 )
 
 __all__ = [
     "check_needs_context",
     "check_relevance",
+    "acheck_relevance",
     "pull_from_chroma",
     "search_arxiv",
     "filter_game_theory_papers",
+    "afilter_game_theory_papers",
     "add_to_chroma",
     "generate_response",
+    "agenerate_response",
     "extract_pdf_urls_from_results",
     "download_pdfs_from_state",
 ]
@@ -5,8 +5,12 @@ This module contains nodes that determine whether user queries require
 game theory context and whether retrieved context is relevant for answering
 queries. Both nodes use LLM-based classification to make routing decisions.
 """
-from typing import TYPE_CHECKING
+import logging
+import re
+from typing import TYPE_CHECKING, Optional
+from langchain_core.prompt_values import PromptValue
 from langchain_core.prompts import ChatPromptTemplate
+from src.llm_batcher import LLMBatcher
 from src.state import GraphState
 
 # Import BaseChatModel for type hints (needed at runtime for get_type_hints)
@@ -19,10 +23,87 @@ except ImportError:
     else:
         BaseChatModel = object  # Dummy fallback
 
+logger = logging.getLogger(__name__)
+
+# Top-result distance below which retrieved context is accepted as relevant
+# without an LLM call (ChromaDB's default metric is squared L2; lower is closer)
+RELEVANT_DISTANCE_CUTOFF = 0.35
+
+# Top-result distance above which retrieved context is rejected without an LLM
+# call. Embeddings are unit length, so squared L2 is twice the cosine
+# distance: 1.2 corresponds to a cosine similarity of 0.4.
+IRRELEVANT_DISTANCE_CUTOFF = 1.2
+
+# Terms that on their own mark a query as game theory related
+GAME_THEORY_KEYWORDS = re.compile(
+    r"\b(?:game[- ]theor\w*|nash|prisoner'?s'? dilemma|minimax|"
+    r"maximin|zero[- ]sum|pareto|shapley|mechanism design|"
+    r"dominant strateg\w*|mixed strateg\w*|subgame|"
+    r"evolutionarily stable|stag hunt|chicken game|ultimatum game)\b",
+    re.IGNORECASE
+)
+
+# Weaker terms; a query mentioning at least two of them is also accepted
+GAME_THEORY_VOCAB = frozenset({
+    "game", "games", "player", "players", "strategy", "strategies",
+    "strategic", "payoff", "payoffs", "auction", "auctions", "bargaining",
+    "cooperative", "coalition", "coalitions", "bidding", "utility",
+    "rational", "rationality", "incentive", "incentives", "opponent",
+    "equilibrium", "equilibria",
+})
+
+_WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Classifier prompts, built once at import rather than on every node call
+NEEDS_CONTEXT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an assistant that determines if a query is related to game theory. "
+              "Respond with only 'yes' or 'no'."),
+    ("user", "Is this query related to game theory? Query: {query}")
+])
+
+RELEVANCE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an assistant that determines if provided context is relevant to answer a query. "
+              "Respond with only 'yes' or 'no'."),
+    ("user", "Is this context relevant to answer the query?\n\n"
+            "Query: {query}\n\nContext: {context}")
+])
+
+
+def _matches_game_theory_keywords(query: str) -> bool:
+    """
+    Return True if the query is recognizably about game theory by keywords.
+    
+    A query matches if it contains one of GAME_THEORY_KEYWORDS, or at least
+    two distinct words from GAME_THEORY_VOCAB. A miss is not a negative
+    decision; the caller falls back to the LLM.
+    """
+    if GAME_THEORY_KEYWORDS.search(query):
+        return True
+    words = set(_WORD_PATTERN.findall(query.lower()))
+    return len(words & GAME_THEORY_VOCAB) >= 2
+
+
+def is_yes_response(content: str) -> bool:
+    """
+    Interpret a classifier reply as a yes/no decision.
+    
+    Classifier prompts ask for only 'yes' or 'no' and their LLM calls are
+    capped at a single output token, so only the start of the reply needs
+    to be inspected rather than lower-casing and scanning the whole text.
+    
+    Args:
+        content: The LLM response content.
+    
+    Returns:
+        True if the reply starts with "yes" (case-insensitive, ignoring
+        leading whitespace), False otherwise.
+    """
+    return content.lstrip()[:3].lower() == "yes"
+
 
 def check_needs_context(
     state: GraphState,
-    llm: BaseChatModel
+    batcher: LLMBatcher
 ) -> GraphState:
     """
     Determine if a user query requires game theory context.
@@ -35,8 +116,8 @@ def check_needs_context(
         state: Current workflow state containing the user_query field.
             Expected fields:
                 - user_query: str - The original user question
-        llm: BaseChatModel instance to use for classification. Should
-            be configured with appropriate temperature and model settings.
+        batcher: LLMBatcher wrapping the LLM used for classification.
+            Concurrent queries share batched LLM calls through it.
     
     Returns:
         Updated state with needs_context field set:
@@ -56,31 +137,83 @@ def check_needs_context(
     
     Note:
         The LLM is prompted to respond with only 'yes' or 'no'. The function
-        checks if 'yes' appears in the response (case-insensitive). This is
+        checks if the response starts with 'yes' (case-insensitive). This is
         a simple heuristic that works well for classification tasks.
+        
+        Queries containing unambiguous game theory keywords (see
+        GAME_THEORY_KEYWORDS and GAME_THEORY_VOCAB) are accepted without
+        consulting the LLM.
     """
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are an assistant that determines if a query is related to game theory. "
-                  "Respond with only 'yes' or 'no'."),
-        ("user", "Is this query related to game theory? Query: {query}")
-    ])
+    if _matches_game_theory_keywords(state["user_query"]):
+        state["needs_context"] = True
+        logger.info("✓ NODE: check_needs_context (keyword match)")
+        logger.debug("  Query: %s...", state['user_query'][:60])
+        logger.debug("  Decision: needs_context = True")
+        return state
     
-    chain = prompt | llm
-    response = chain.invoke({"query": state["user_query"]})
+    response = batcher.invoke(NEEDS_CONTEXT_PROMPT.invoke({"query": state["user_query"]}))
     
-    needs_context = "yes" in response.content.lower()
+    needs_context = is_yes_response(response.content)
     state["needs_context"] = needs_context
     
-    print(f"✓ NODE: check_needs_context")
-    print(f"  Query: {state['user_query'][:60]}...")
-    print(f"  LLM Response: {response.content.strip()}")
-    print(f"  Decision: needs_context = {needs_context}")
+    logger.info("✓ NODE: check_needs_context")
+    logger.debug("  Query: %s...", state['user_query'][:60])
+    logger.debug("  LLM Response: %s", response.content.strip())
+    logger.debug("  Decision: needs_context = %s", needs_context)
+    return state
+
+
+def _relevance_shortcut(state: GraphState) -> Optional[bool]:
+    """
+    Decide relevance without the LLM when the retrieval results allow it.
+    
+    Returns:
+        False if there are no documents or the top distance is above
+        IRRELEVANT_DISTANCE_CUTOFF, True if it is below
+        RELEVANT_DISTANCE_CUTOFF, and None when the LLM has to decide.
+    """
+    # No documents found
+    if not state["chroma_results"].get("documents", [[]])[0]:
+        logger.debug("No documents found in Chroma, will search arxiv")
+        return False
+    
+    # Skip the LLM when the nearest document is clearly on-topic
+    distances = state["chroma_results"].get("distances") or [[]]
+    if distances[0] and distances[0][0] < RELEVANT_DISTANCE_CUTOFF:
+        logger.debug("  Top distance: %.3f (< %s)", distances[0][0], RELEVANT_DISTANCE_CUTOFF)
+        logger.debug("  Decision: relevant_context = True (LLM check skipped)")
+        return True
+    
+    # Likewise skip it when even the nearest document is far from the query
+    if distances[0] and distances[0][0] > IRRELEVANT_DISTANCE_CUTOFF:
+        logger.debug("  Top distance: %.3f (> %s)", distances[0][0], IRRELEVANT_DISTANCE_CUTOFF)
+        logger.debug("  Decision: relevant_context = False (LLM check skipped)")
+        return False
+    
+    return None
+
+
+def _relevance_prompt(state: GraphState) -> PromptValue:
+    """Format the relevance prompt from the query and the top 2 documents."""
+    docs = state["chroma_results"]["documents"][0]
+    combined_docs = "\n\n".join(docs[:2])  # Use top 2 documents
+    return RELEVANCE_PROMPT.invoke({"query": state["user_query"], "context": combined_docs})
+
+
+def _record_relevance(state: GraphState, content: str) -> GraphState:
+    """Store the LLM's relevance decision in the state."""
+    relevant = is_yes_response(content)
+    state["relevant_context"] = relevant
+    
+    logger.debug("  Documents evaluated: %s", len(state["chroma_results"]["documents"][0]))
+    logger.debug("  LLM Response: %s", content.strip())
+    logger.debug("  Decision: relevant_context = %s", relevant)
     return state
 
 
 def check_relevance(
     state: GraphState,
-    llm: BaseChatModel
+    batcher: LLMBatcher
 ) -> GraphState:
     """
     Evaluate whether retrieved context from vector DB is relevant to the query.
@@ -92,14 +225,19 @@ def check_relevance(
     
     If no documents were found in chroma_results, this node immediately
     sets relevant_context to False and returns, bypassing LLM evaluation.
+    Likewise, if the top document's distance is below
+    RELEVANT_DISTANCE_CUTOFF, the context is clearly relevant, and if it is
+    above IRRELEVANT_DISTANCE_CUTOFF, the context is clearly off-topic; in
+    both cases the LLM is not consulted. Only ambiguous distances in between
+    are judged by the LLM.
     
     Args:
         state: Current workflow state containing:
             - user_query: str - The original user question
             - chroma_results: Dict - Results from vector DB query with
               structure: {"documents": [[str, ...]], ...}
-        llm: BaseChatModel instance to use for relevance evaluation.
-            Should be configured appropriately for classification tasks.
+        batcher: LLMBatcher wrapping the LLM used for relevance evaluation.
+            Concurrent queries share batched LLM calls through it.
     
     Returns:
         Updated state with relevant_context field set:
@@ -109,6 +247,9 @@ def check_relevance(
     State Modifications:
         - Sets state["relevant_context"] to True or False
         - Early returns if no documents found (sets to False)
+        - Early returns if the top distance is below the cutoff (sets to True)
+        - Early returns if the top distance is above the irrelevance cutoff
+          (sets to False)
     
     Example State Transition:
         Input state:
@@ -123,35 +264,43 @@ def check_relevance(
     Note:
         Only uses the top 2 documents from chroma_results for evaluation
         to keep the prompt size manageable. The LLM is prompted to respond
-        with only 'yes' or 'no', and the function checks for 'yes' in the
-        response (case-insensitive).
+        with only 'yes' or 'no', and the function checks whether the
+        response starts with 'yes' (case-insensitive).
     """
-    # Early return if no documents found
-    if not state["chroma_results"].get("documents", [[]])[0]:
-        state["relevant_context"] = False
-        print("No documents found in Chroma, will search arxiv")
+    logger.info("✓ NODE: check_relevance")
+    
+    decision = _relevance_shortcut(state)
+    if decision is not None:
+        state["relevant_context"] = decision
         return state
     
-    # Extract top documents for evaluation
-    docs = state["chroma_results"]["documents"][0]
-    combined_docs = "\n\n".join(docs[:2])  # Use top 2 documents
+    response = batcher.invoke(_relevance_prompt(state))
+    return _record_relevance(state, response.content)
+
+
+async def acheck_relevance(
+    state: GraphState,
+    batcher: LLMBatcher
+) -> GraphState:
+    """
+    Async variant of check_relevance, used by GameTheoryRAG.aquery().
     
-    prompt = ChatPromptTemplate.from_messages([
-        ("system", "You are an assistant that determines if provided context is relevant to answer a query. "
-                  "Respond with only 'yes' or 'no'."),
-        ("user", "Is this context relevant to answer the query?\n\n"
-                "Query: {query}\n\nContext: {context}")
-    ])
+    Applies the same distance shortcuts, then awaits the LLM judgement
+    through the batcher instead of blocking a thread on it.
     
-    chain = prompt | llm
-    response = chain.invoke({"query": state["user_query"], "context": combined_docs})
+    Args:
+        state: Current workflow state (see check_relevance).
+        batcher: LLMBatcher wrapping the LLM used for relevance evaluation.
     
-    relevant = "yes" in response.content.lower()
-    state["relevant_context"] = relevant
+    Returns:
+        Updated state with relevant_context set (see check_relevance).
+    """
+    logger.info("✓ NODE: check_relevance")
     
-    print(f"✓ NODE: check_relevance")
-    print(f"  Documents evaluated: {len(docs)}")
-    print(f"  LLM Response: {response.content.strip()}")
-    print(f"  Decision: relevant_context = {relevant}")
-    return state
-
+    decision = _relevance_shortcut(state)
+    if decision is not None:
+        state["relevant_context"] = decision
+        return state
+    
+    response = await batcher.ainvoke(_relevance_prompt(state))
+    return _record_relevance(state, response.content)
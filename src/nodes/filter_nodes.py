@@ -4,6 +4,9 @@ Filter nodes for post-processing results.
 This module contains nodes that filter and validate results after retrieval,
 ensuring only game theory relevant content is used.
 """
+import logging
+from typing import Any, Dict, List
+from langchain_core.messages import BaseMessage
 from langchain_core.prompts import ChatPromptTemplate
 from src.state import GraphState
 
@@ -17,6 +20,75 @@ except ImportError:
         BaseChatModel = object
 
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of paper classification requests in flight at once
+MAX_FILTER_CONCURRENCY = 8
+
+# Paper classification prompt, built once at import rather than per paper
+GAME_THEORY_PAPER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an assistant that determines if an academic paper is related to GAME THEORY "
+              "(the mathematical study of strategic decision-making). "
+              "Respond with only 'yes' or 'no'. "
+              "Only say 'yes' if the paper is actually about game theory, Nash equilibrium, "
+              "strategic interactions, etc. Say 'no' for papers about video games, optimization, "
+              "or other unrelated topics even if they mention 'game' or 'theory'."),
+    ("user", "Is this paper related to GAME THEORY (mathematical strategic decision-making)?\n\n"
+            "Title: {title}\n\n"
+            "Abstract: {summary}")
+])
+
+
+def _paper_prompt_input(paper: Dict[str, Any]) -> Dict[str, str]:
+    """Build the classification prompt variables for one paper."""
+    title = paper.get("title", "")
+    summary = paper.get("summary", "")[:500]  # First 500 chars of abstract
+    
+    # Escape curly braces in title/summary to prevent template variable interpretation
+    return {
+        "title": title.replace("{", "{{").replace("}", "}}"),
+        "summary": summary.replace("{", "{{").replace("}", "}}")
+    }
+
+
+def _apply_paper_decisions(
+    state: GraphState,
+    papers: List[Dict[str, Any]],
+    responses: List[BaseMessage]
+) -> GraphState:
+    """
+    Keep the papers the LLM classified as game theory and record every
+    paper as seen.
+    """
+    filtered_papers = []
+    for i, (paper, response) in enumerate(zip(papers, responses), 1):
+        title = paper.get("title", "")
+        is_game_theory = "yes" in response.content.lower()
+        
+        if is_game_theory:
+            filtered_papers.append(paper)
+            logger.debug("    Paper %s: ✓ Game theory - '%s...'", i, title[:50])
+        else:
+            logger.debug("    Paper %s: ✗ Not game theory - '%s...'", i, title[:50])
+    
+    state["arxiv_papers"] = filtered_papers
+    
+    # Track seen papers to prevent infinite loops. Copy rather than append
+    # in place: the incoming list may be shared (e.g. the initial state
+    # template's empty list).
+    papers_seen = list(state.get("papers_seen", []))
+    for paper in papers:
+        entry_id = paper.get("entry_id")
+        if entry_id and entry_id not in papers_seen:
+            papers_seen.append(entry_id)
+    state["papers_seen"] = papers_seen
+    
+    logger.debug("  Filtered to %s game theory paper(s)", len(filtered_papers))
+    logger.debug("  Total papers seen in this query: %s", len(papers_seen))
+    
+    return state
+
+
 def filter_game_theory_papers(
     state: GraphState,
     llm: BaseChatModel
@@ -61,67 +133,62 @@ def filter_game_theory_papers(
     
     Note:
         - Evaluates each paper's title and abstract
-        - Uses LLM to classify if paper is game theory related
+        - Uses LLM to classify if paper is game theory related; all papers
+          are sent in one chain.batch() call (at most
+          MAX_FILTER_CONCURRENCY requests in flight)
         - Only papers classified as game theory are kept
         - Empty list if no papers are game theory related
     """
-    print(f"✓ NODE: filter_game_theory_papers")
+    logger.info("✓ NODE: filter_game_theory_papers")
     
     papers = state.get("arxiv_papers", [])
     if not papers:
-        print(f"  No papers to filter")
+        logger.debug("  No papers to filter")
         return state
     
-    print(f"  Filtering {len(papers)} paper(s) for game theory relevance...")
+    logger.debug("  Filtering %s paper(s) for game theory relevance...", len(papers))
     
-    filtered_papers = []
+    # One batch call for all papers: requests run concurrently and batching
+    # backends (vLLM, LM Studio, Ollama) can share a forward pass
+    chain = GAME_THEORY_PAPER_PROMPT | llm
+    responses = chain.batch(
+        [_paper_prompt_input(paper) for paper in papers],
+        config={"max_concurrency": MAX_FILTER_CONCURRENCY}
+    )
+    return _apply_paper_decisions(state, papers, responses)
+
+
+async def afilter_game_theory_papers(
+    state: GraphState,
+    llm: BaseChatModel
+) -> GraphState:
+    """
+    Async variant of filter_game_theory_papers, used by GameTheoryRAG.aquery().
     
-    for i, paper in enumerate(papers, 1):
-        title = paper.get("title", "")
-        summary = paper.get("summary", "")[:500]  # First 500 chars of abstract
-        
-        # Escape curly braces in title/summary to prevent template variable interpretation
-        title_escaped = title.replace("{", "{{").replace("}", "}}")
-        summary_escaped = summary.replace("{", "{{").replace("}", "}}")
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an assistant that determines if an academic paper is related to GAME THEORY "
-                      "(the mathematical study of strategic decision-making). "
-                      "Respond with only 'yes' or 'no'. "
-                      "Only say 'yes' if the paper is actually about game theory, Nash equilibrium, "
-                      "strategic interactions, etc. Say 'no' for papers about video games, optimization, "
-                      "or other unrelated topics even if they mention 'game' or 'theory'."),
-            ("user", "Is this paper related to GAME THEORY (mathematical strategic decision-making)?\n\n"
-                    "Title: {title}\n\n"
-                    "Abstract: {summary}")
-        ])
-        
-        chain = prompt | llm
-        response = chain.invoke({
-            "title": title_escaped,
-            "summary": summary_escaped
-        })
-        
-        is_game_theory = "yes" in response.content.lower()
-        
-        if is_game_theory:
-            filtered_papers.append(paper)
-            print(f"    Paper {i}: ✓ Game theory - '{title[:50]}...'")
-        else:
-            print(f"    Paper {i}: ✗ Not game theory - '{title[:50]}...'")
+    Classifies all papers concurrently with chain.abatch(), so the node
+    takes roughly one LLM round-trip instead of one per paper. As in the
+    sync node, at most MAX_FILTER_CONCURRENCY requests are in flight.
     
-    state["arxiv_papers"] = filtered_papers
+    Args:
+        state: Current workflow state (see filter_game_theory_papers).
+        llm: BaseChatModel instance for evaluating paper relevance.
     
-    # Track seen papers to prevent infinite loops
-    papers_seen = state.get("papers_seen", [])
-    for paper in papers:
-        entry_id = paper.get("entry_id")
-        if entry_id and entry_id not in papers_seen:
-            papers_seen.append(entry_id)
-    state["papers_seen"] = papers_seen
+    Returns:
+        Updated state with arxiv_papers filtered (see
+        filter_game_theory_papers).
+    """
+    logger.info("✓ NODE: filter_game_theory_papers")
+    
+    papers = state.get("arxiv_papers", [])
+    if not papers:
+        logger.debug("  No papers to filter")
+        return state
     
-    print(f"  Filtered to {len(filtered_papers)} game theory paper(s)")
-    print(f"  Total papers seen in this query: {len(papers_seen)}")
+    logger.debug("  Filtering %s paper(s) for game theory relevance...", len(papers))
     
-    return state
-
+    chain = GAME_THEORY_PAPER_PROMPT | llm
+    responses = await chain.abatch(
+        [_paper_prompt_input(paper) for paper in papers],
+        config={"max_concurrency": MAX_FILTER_CONCURRENCY}
+    )
+    return _apply_paper_decisions(state, papers, responses)
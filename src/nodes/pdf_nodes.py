@@ -7,14 +7,59 @@ clean extensions - they use the same chroma_results as the RAG workflow but
 branch to PDF processing instead.
 
 The nodes extract pdf_url from metadata and use the standalone PDFDownloader
-tool, following the explicit dependency injection pattern.
+tool, following the explicit dependency injection pattern. Downloads are
+network-bound, so each node fetches its PDFs concurrently.
 """
-from typing import List, Set
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Set
 from src.state import GraphState
 
 # Import for type hints (needed at runtime)
 from src.pdf_downloader import PDFDownloader
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of PDFs fetched at once (keeps arxiv.org rate limits in mind)
+MAX_CONCURRENT_DOWNLOADS = 8
+
+
+def _download_all(
+    pdf_downloader: PDFDownloader,
+    pdf_urls: Iterable[str]
+) -> List[str]:
+    """
+    Download several PDFs concurrently.
+    
+    Each download runs on a worker thread, so total latency is roughly that
+    of the slowest download instead of the sum of all of them. Concurrency
+    is capped at MAX_CONCURRENT_DOWNLOADS.
+    
+    Args:
+        pdf_downloader: PDFDownloader instance used for every download.
+        pdf_urls: URLs to download.
+    
+    Returns:
+        Paths of the PDFs that downloaded successfully. Failed downloads are
+        logged and skipped.
+    """
+    pdf_urls = list(pdf_urls)
+    if not pdf_urls:
+        return []
+    
+    def download_one(pdf_url: str) -> Optional[str]:
+        try:
+            return pdf_downloader.download(pdf_url)
+        except Exception as e:
+            logger.warning("✗ Error downloading %s: %s", pdf_url, e)
+            # Continue with remaining PDFs
+            return None
+    
+    workers = min(MAX_CONCURRENT_DOWNLOADS, len(pdf_urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(download_one, pdf_urls)
+        return [pdf_path for pdf_path in results if pdf_path]
+
 
 def extract_pdf_urls_from_results(
     state: GraphState,
@@ -70,9 +115,10 @@ def extract_pdf_urls_from_results(
         - Deduplicates PDF URLs (multiple chunks from same paper = one download)
         - Only downloads if pdf_url exists in metadata
         - Continues with remaining PDFs if one download fails
+        - PDFs are downloaded concurrently (up to MAX_CONCURRENT_DOWNLOADS)
         - Downloads are stored in default directory (./papers) unless configured
     """
-    print("Extracting PDF URLs from vector DB results...")
+    logger.info("Extracting PDF URLs from vector DB results...")
     
     # Extract unique PDF URLs from metadata
     pdf_urls: Set[str] = set()
@@ -85,26 +131,17 @@ def extract_pdf_urls_from_results(
                 pdf_urls.add(metadata["pdf_url"])
     
     if not pdf_urls:
-        print("No PDF URLs found in metadata")
+        logger.debug("No PDF URLs found in metadata")
         state["downloaded_pdfs"] = []
         return state
     
-    print(f"Found {len(pdf_urls)} unique PDF URLs to download")
+    logger.debug("Found %s unique PDF URLs to download", len(pdf_urls))
     
-    # Download each PDF
-    downloaded_paths: List[str] = []
-    for pdf_url in pdf_urls:
-        try:
-            pdf_path = pdf_downloader.download(pdf_url)
-            if pdf_path:
-                downloaded_paths.append(pdf_path)
-        except Exception as e:
-            print(f"✗ Error downloading {pdf_url}: {e}")
-            # Continue with next PDF
-            continue
+    # Download all PDFs concurrently
+    downloaded_paths = _download_all(pdf_downloader, pdf_urls)
     
     state["downloaded_pdfs"] = downloaded_paths
-    print(f"✓ Downloaded {len(downloaded_paths)} PDFs")
+    logger.debug("✓ Downloaded %s PDFs", len(downloaded_paths))
     
     return state
 
@@ -134,7 +171,7 @@ def download_pdfs_from_state(
         - Can be used when PDF URLs come from arxiv_papers instead of metadata
         - Demonstrates flexibility in workflow design
     """
-    print("Downloading PDFs from state...")
+    logger.info("Downloading PDFs from state...")
     
     downloaded_paths: List[str] = []
     
@@ -145,17 +182,10 @@ def download_pdfs_from_state(
             if "pdf_url" in paper and paper["pdf_url"]:
                 pdf_urls.add(paper["pdf_url"])
         
-        for pdf_url in pdf_urls:
-            try:
-                pdf_path = pdf_downloader.download(pdf_url)
-                if pdf_path:
-                    downloaded_paths.append(pdf_path)
-            except Exception as e:
-                print(f"✗ Error downloading {pdf_url}: {e}")
-                continue
+        downloaded_paths = _download_all(pdf_downloader, pdf_urls)
     
     state["downloaded_pdfs"] = downloaded_paths
-    print(f"✓ Downloaded {len(downloaded_paths)} PDFs")
+    logger.debug("✓ Downloaded %s PDFs", len(downloaded_paths))
     
     return state
 
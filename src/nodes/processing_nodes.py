@@ -8,12 +8,15 @@ document processors and vector databases to expand the knowledge base.
 Processing nodes typically use multiple tools (e.g., both document processor
 and vector DB), making their dependencies explicit in function signatures.
 """
+import logging
 from src.state import GraphState
 
 # Import for type hints (needed at runtime)
 from src.vector_db import VectorDBManager
 from src.document_processor import DocumentProcessor
 
+logger = logging.getLogger(__name__)
+
 
 def add_to_chroma(
     state: GraphState,
@@ -27,8 +30,8 @@ def add_to_chroma(
     for storage in ChromaDB. It:
     1. Chunks each paper (title + abstract) into processable pieces
     2. Extracts metadata from each chunk
-    3. Adds chunks to the vector database with unique IDs
-    4. Handles errors gracefully, continuing with remaining papers if one fails
+    3. Adds all chunks to the vector database in one batch with unique IDs
+    4. Handles errors gracefully, skipping any paper that fails to process
     
     This node demonstrates multi-tool dependency: it requires both
     document_processor (for chunking) and vector_db (for storage).
@@ -69,46 +72,79 @@ def add_to_chroma(
         Additionally, vector_db now contains new document chunks.
     
     Error Handling:
-        - If processing a paper fails, logs error and continues with next paper
+        - If batch chunking fails, papers are re-chunked one at a time; a
+          paper that fails is logged and skipped
+        - If the batch insert fails, logs error (no chunks are counted as added)
         - Node always sets papers_added=True even if some papers failed
         - This ensures workflow can continue even with partial failures
     
     Note:
-        - Processes papers sequentially (one at a time)
+        - Papers whose first chunk is already in the vector DB are skipped
+          before chunking; chunk IDs are also deduplicated by add_documents
+        - All papers are chunked with one process_papers call, then inserted
+          with a single add_documents call
         - Each paper may produce multiple chunks depending on abstract length
         - Chunk IDs are constructed as: "{entry_id}_chunk_{index}"
         - Metadata includes: title, authors, published date, source, chunk_index
         - Database count is logged before and after for verification
+          (only when DEBUG logging is enabled)
     """
-    count_before = vector_db.count()
-    print(f"Processing and adding papers to Chroma DB...")
-    print(f"  DB count before adding: {count_before} documents")
+    logger.info("Processing and adding papers to Chroma DB...")
+    # The count is only needed for the debug summary; skip the DB call otherwise
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        count_before = vector_db.count()
+        logger.debug("  DB count before adding: %s documents", count_before)
     
-    total_chunks_added = 0
+    # Chunk every paper first, then insert all chunks in a single batch so
+    # embedding and index persistence are paid once per run, not per paper
+    # Papers already ingested (by an earlier query) are skipped before
+    # chunking; their first chunk ID is enough to recognize them
+    papers = []
     for paper in state["arxiv_papers"]:
+        entry_id = paper.get("entry_id")
+        if entry_id and vector_db.has_document(doc_processor.chunk_id(entry_id, 0)):
+            logger.debug("  Already stored, skipping: %s...", paper.get("title", "")[:50])
+            continue
+        papers.append(paper)
+    
+    try:
+        # Chunk all papers in one call (batched when the fast splitter is on)
+        paper_chunks = list(zip(papers, doc_processor.process_papers(papers)))
+    except Exception:
+        # A malformed paper fails the batch; redo paper by paper so the
+        # others are still added
+        paper_chunks = []
+        for paper in papers:
+            try:
+                paper_chunks.append((paper, doc_processor.process_paper(paper)))
+            except Exception as e:
+                logger.warning("  ✗ Error processing paper: %s", e)
+                # Continue with next paper even if one fails
+    
+    documents = []
+    metadatas = []
+    ids = []
+    for paper, chunks in paper_chunks:
+        documents.extend(chunk["text"] for chunk in chunks)
+        metadatas.extend(chunk["metadata"] for chunk in chunks)
+        ids.extend(chunk["id"] for chunk in chunks)
+        logger.debug("  ✓ Prepared %s chunks from paper: %s...", len(chunks), paper['title'][:50])
+    
+    total_chunks_added = 0
+    if ids:
         try:
-            # Process paper into chunks using document processor
-            chunks = doc_processor.process_paper(paper)
-            
-            # Extract data for Chroma (list of lists format)
-            documents = [chunk["text"] for chunk in chunks]
-            metadatas = [chunk["metadata"] for chunk in chunks]
-            ids = [chunk["id"] for chunk in chunks]
-            
             # Add to vector DB using vector_db manager
             vector_db.add_documents(documents, metadatas, ids)
-            total_chunks_added += len(chunks)
-            
-            print(f"  ✓ Added {len(chunks)} chunks from paper: {paper['title'][:50]}...")
+            total_chunks_added = len(ids)
         except Exception as e:
-            print(f"  ✗ Error adding paper to Chroma: {e}")
-            # Continue with next paper even if one fails
-            continue
+            logger.warning("  ✗ Error adding papers to Chroma: %s", e)
     
-    count_after = vector_db.count()
-    print(f"  DB count after adding: {count_after} documents")
-    print(f"  Total chunks added in this run: {total_chunks_added}")
-    print(f"  DB growth: {count_after - count_before} documents")
+    if debug:
+        count_after = vector_db.count()
+        logger.debug("  DB count after adding: %s documents", count_after)
+        logger.debug("  Total chunks added in this run: %s", total_chunks_added)
+        logger.debug("  DB growth: %s documents", count_after - count_before)
     
     state["papers_added"] = True
     return state
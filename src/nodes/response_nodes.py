@@ -5,6 +5,8 @@ This module contains nodes that generate the final output for the user.
 These nodes combine retrieved context with LLM capabilities to produce
 coherent, contextually-aware responses.
 """
+import logging
+from typing import Optional
 from langchain_core.prompts import ChatPromptTemplate
 from src.state import GraphState
 
@@ -20,6 +22,50 @@ except ImportError:
         BaseChatModel = object  # Dummy fallback
 
 
+logger = logging.getLogger(__name__)
+
+# Answer prompt, built once at import rather than on every node call
+RESPONSE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are a helpful assistant that answers questions about game theory. "
+              "Use the provided context to answer the user's question."),
+    ("user", "Context:\n{context}\n\nQuestion: {query}\n\nAnswer:")
+])
+
+
+def _response_context(state: GraphState) -> Optional[str]:
+    """
+    Join the top 3 retrieved documents into the prompt context.
+    
+    Returns:
+        The context string, or None if no documents were retrieved.
+    """
+    docs = state["chroma_results"].get("documents", [[]])[0]
+    if not docs:
+        return None
+    context = "\n\n".join(docs[:3])  # Use top 3 documents
+    logger.debug("  Using context: %s document(s), %s chars", len(docs[:3]), len(context))
+    return context
+
+
+def _set_fallback_response(state: GraphState) -> GraphState:
+    """Set the no-context fallback message as the final response."""
+    # Check if we searched arxiv but found no game theory papers
+    arxiv_papers = state.get("arxiv_papers", [])
+    if len(arxiv_papers) == 0 and state.get("user_query"):
+        # No vector DB results AND no game theory papers from arxiv
+        logger.debug("  No context available and no game theory papers found")
+        state["final_response"] = (
+            "I don't have enough information to answer your question about game theory. "
+            "The query does not appear to be related to game theory, or no relevant "
+            "game theory papers were found."
+        )
+    else:
+        # No context but might have other reasons
+        logger.debug("  No context available, using fallback message")
+        state["final_response"] = "I don't have enough information to answer your question about game theory."
+    return state
+
+
 def generate_response(
     state: GraphState,
     llm: BaseChatModel
@@ -79,42 +125,55 @@ def generate_response(
         - Context is combined with newlines for readability
         - System prompt instructs LLM to answer about game theory specifically
         - The user query is included in the prompt to ensure relevance
+        - The LLM output is consumed via chain.stream() and accumulated, so
+          token chunks are visible to LangGraph's "messages" stream mode
     """
-    print(f"✓ NODE: generate_response")
-    print(f"  Query: {state['user_query'][:60]}...")
+    logger.info("✓ NODE: generate_response")
+    logger.debug("  Query: %s...", state['user_query'][:60])
     
-    # Get context from Chroma results
-    if state["chroma_results"].get("documents", [[]])[0]:
-        docs = state["chroma_results"]["documents"][0]
-        context = "\n\n".join(docs[:3])  # Use top 3 documents
-        
-        print(f"  Using context: {len(docs[:3])} document(s), {len(context)} chars")
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are a helpful assistant that answers questions about game theory. "
-                      "Use the provided context to answer the user's question."),
-            ("user", "Context:\n{context}\n\nQuestion: {query}\n\nAnswer:")
-        ])
-        
-        chain = prompt | llm
-        response = chain.invoke({"context": context, "query": state["user_query"]})
-        state["final_response"] = response.content
-        print(f"  Generated response: {len(response.content)} chars")
-    else:
-        # Check if we searched arxiv but found no game theory papers
-        arxiv_papers = state.get("arxiv_papers", [])
-        if len(arxiv_papers) == 0 and state.get("user_query"):
-            # No vector DB results AND no game theory papers from arxiv
-            print(f"  No context available and no game theory papers found")
-            state["final_response"] = (
-                "I don't have enough information to answer your question about game theory. "
-                "The query does not appear to be related to game theory, or no relevant "
-                "game theory papers were found."
-            )
-        else:
-            # No context but might have other reasons
-            print(f"  No context available, using fallback message")
-            state["final_response"] = "I don't have enough information to answer your question about game theory."
+    context = _response_context(state)
+    if context is None:
+        return _set_fallback_response(state)
     
+    chain = RESPONSE_PROMPT | llm
+    # Stream tokens so callers using GameTheoryRAG.query_stream() can
+    # render the answer while the rest is still being generated
+    chunks = []
+    for chunk in chain.stream({"context": context, "query": state["user_query"]}):
+        chunks.append(chunk.content)
+    state["final_response"] = "".join(chunks)
+    logger.debug("  Generated response: %s chars", len(state['final_response']))
     return state
 
+
+async def agenerate_response(
+    state: GraphState,
+    llm: BaseChatModel
+) -> GraphState:
+    """
+    Async variant of generate_response, used by GameTheoryRAG.aquery().
+    
+    Builds the same prompt and fallback messages, but consumes the LLM with
+    chain.astream() so the event loop is free while tokens are generated.
+    
+    Args:
+        state: Current workflow state (see generate_response).
+        llm: BaseChatModel instance configured for response generation.
+    
+    Returns:
+        Updated state with final_response populated (see generate_response).
+    """
+    logger.info("✓ NODE: generate_response")
+    logger.debug("  Query: %s...", state['user_query'][:60])
+    
+    context = _response_context(state)
+    if context is None:
+        return _set_fallback_response(state)
+    
+    chain = RESPONSE_PROMPT | llm
+    chunks = []
+    async for chunk in chain.astream({"context": context, "query": state["user_query"]}):
+        chunks.append(chunk.content)
+    state["final_response"] = "".join(chunks)
+    logger.debug("  Generated response: %s chars", len(state['final_response']))
+    return state
@@ -8,12 +8,15 @@ This module contains nodes that retrieve information from external sources:
 These nodes are responsible for gathering the raw data that will be
 processed and used by downstream nodes in the workflow.
 """
+import logging
 from src.state import GraphState
 
 # Import for type hints (needed at runtime)
 from src.vector_db import VectorDBManager
 from src.arxiv_search import ArxivSearcher
 
+logger = logging.getLogger(__name__)
+
 
 def pull_from_chroma(
     state: GraphState,
@@ -48,6 +51,7 @@ def pull_from_chroma(
     
     State Modifications:
         - Sets state["chroma_results"] to the query results dictionary
+        - Sets state["query_embedding"] on first call (reused afterwards)
         - Results may be empty if no documents match or database is empty
     
     Example State Transition:
@@ -66,18 +70,29 @@ def pull_from_chroma(
         - Uses n_results=3 to get top 3 most relevant documents
         - If database is empty, chroma_results["documents"] will be [[]]
         - Query uses semantic similarity based on embeddings stored in ChromaDB
+        - The query embedding is cached in state, so re-entering this node
+          after add_to_chroma does not embed the query a second time
     """
-    print(f"✓ NODE: pull_from_chroma")
-    print(f"  Query: {state['user_query'][:60]}...")
-    print(f"  Vector DB contains: {vector_db.count()} documents")
-    
-    results = vector_db.query(state["user_query"], n_results=3)
+    logger.info("✓ NODE: pull_from_chroma")
+    logger.debug("  Query: %s...", state['user_query'][:60])
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("  Vector DB contains: %s documents", vector_db.count())
+    
+    # Embed the query once; the loop back from add_to_chroma reuses it
+    if not state.get("query_embedding"):
+        state["query_embedding"] = vector_db.embed_query(state["user_query"])
+    
+    results = vector_db.query(
+        state["user_query"],
+        n_results=3,
+        query_embedding=state["query_embedding"]
+    )
     state["chroma_results"] = results
     
     num_docs = len(results.get("documents", [[]])[0])
-    print(f"  Retrieved: {num_docs} document(s)")
+    logger.debug("  Retrieved: %s document(s)", num_docs)
     if num_docs > 0:
-        print(f"  Sample doc length: {len(results.get('documents', [[]])[0][0])} chars")
+        logger.debug("  Sample doc length: %s chars", len(results.get('documents', [[]])[0][0]))
     
     return state
 
@@ -142,12 +157,12 @@ def search_arxiv(
         - Only metadata is returned; full PDFs are not downloaded here
         - If search fails or returns no results, arxiv_papers will be []
     """
-    print(f"✓ NODE: search_arxiv")
-    print(f"  Query: {state['user_query'][:60]}...")
+    logger.info("✓ NODE: search_arxiv")
+    logger.debug("  Query: %s...", state['user_query'][:60])
     
     # Create search query by prefixing with "game theory"
     search_query = f"game theory {state['user_query']}"
-    print(f"  Arxiv search query: {search_query}")
+    logger.debug("  Arxiv search query: %s", search_query)
     
     papers = arxiv_searcher.search_papers(search_query)
     
@@ -156,11 +171,11 @@ def search_arxiv(
     new_papers = [p for p in papers if p.get("entry_id") not in papers_seen]
     
     state["arxiv_papers"] = new_papers
-    print(f"  Retrieved: {len(papers)} paper(s) from arxiv")
-    print(f"  New papers (not seen before): {len(new_papers)}")
+    logger.debug("  Retrieved: %s paper(s) from arxiv", len(papers))
+    logger.debug("  New papers (not seen before): %s", len(new_papers))
     if new_papers:
         for i, paper in enumerate(new_papers[:2], 1):
-            print(f"    Paper {i}: {paper.get('title', 'N/A')[:60]}...")
+            logger.debug("    Paper %s: %s...", i, paper.get('title', 'N/A')[:60])
     
     return state
 
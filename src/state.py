@@ -35,6 +35,10 @@ class GraphState(TypedDict):
             }
             Set by pull_from_chroma node.
             
+        query_embedding: Embedding vector of user_query, computed once by the
+            first pull_from_chroma call and reused when the workflow loops back
+            after add_to_chroma. Empty list until computed.
+            
         relevant_context: Boolean flag indicating whether retrieved context
             is relevant to answer the query. Set by check_relevance node.
             
@@ -61,6 +65,7 @@ class GraphState(TypedDict):
                 "user_query": "What is Nash equilibrium?",
                 "needs_context": False,
                 "chroma_results": {},
+                "query_embedding": [],
                 "relevant_context": False,
                 "arxiv_papers": [],
                 "papers_added": False,
@@ -74,6 +79,7 @@ class GraphState(TypedDict):
     user_query: str
     needs_context: bool
     chroma_results: List[Dict[str, Any]]
+    query_embedding: List[float]  # Cached embedding of user_query
     relevant_context: bool
     arxiv_papers: List[Dict[str, Any]]
     papers_added: bool
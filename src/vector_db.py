@@ -12,7 +12,8 @@ ChromaDB Integration:
     grow and persist across workflow executions.
 
 Persistence Strategy:
-    - Database is stored in a configurable directory (default: ./chroma_db)
+    - Database is stored in a configurable directory (default: ./chroma_db,
+      or ./chroma_db_<worker> under pytest-xdist)
     - All documents are persisted to disk automatically
     - The same collection is reused across instances pointing to the same directory
     - This enables the workflow to build a persistent knowledge base over time
@@ -28,10 +29,117 @@ Vector Search:
     - Query results are sorted by relevance (similarity score)
     - Results include documents, metadata, IDs, and similarity distances
 """
+from collections import OrderedDict
 import chromadb
+from chromadb.api import ClientAPI
+from chromadb.api.types import EmbeddingFunction
+from chromadb.api.client import SharedSystemClient
 from chromadb.config import Settings
-from typing import List, Dict, Any
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+from typing import Callable, List, Dict, Any, Optional
 import os
+import threading
+
+
+# Fields returned by queries. Listed explicitly so ChromaDB never ships
+# embeddings (384 floats per hit) back to callers that do not use them.
+QUERY_INCLUDE = ["documents", "metadatas", "distances"]
+
+# Number of query embeddings kept by embed_query's LRU cache
+EMBEDDING_CACHE_SIZE = 1024
+
+# Database directory used when none is given
+DEFAULT_PERSIST_DIRECTORY = "./chroma_db"
+
+
+class _SharedDirectory:
+    """Client and stored-ID set shared by every manager on one directory."""
+    
+    def __init__(self, client: ClientAPI):
+        self.client = client
+        # IDs known to be in the collection; seeded by the first manager
+        self.ids = None
+        # Guards ids: managers on the same directory may write from
+        # different threads
+        self.ids_lock = threading.Lock()
+
+
+# One entry per database directory (keyed by real path), shared by every
+# VectorDBManager opened on it
+_CLIENT_CACHE: Dict[str, _SharedDirectory] = {}
+_CLIENT_LOCK = threading.Lock()
+
+# Called by release_clients, for modules that cache managers of their own
+_RELEASE_HOOKS: List[Callable[[], None]] = []
+
+
+def default_persist_directory() -> str:
+    """
+    Return the default database directory for this process.
+    
+    Under pytest-xdist each worker gets its own directory (e.g.
+    ./chroma_db_gw0), so parallel workers never contend for one SQLite file.
+    
+    Returns:
+        DEFAULT_PERSIST_DIRECTORY, suffixed with PYTEST_XDIST_WORKER if set.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker:
+        return f"{DEFAULT_PERSIST_DIRECTORY}_{worker}"
+    return DEFAULT_PERSIST_DIRECTORY
+
+
+def _get_shared_directory(persist_directory: str) -> _SharedDirectory:
+    """
+    Return the shared state for a directory, creating its client once.
+    
+    Args:
+        persist_directory: Database directory; must already exist.
+    
+    Returns:
+        _SharedDirectory holding the directory's ChromaDB client.
+    """
+    key = os.path.realpath(persist_directory)
+    with _CLIENT_LOCK:
+        shared = _CLIENT_CACHE.get(key)
+        if shared is None:
+            shared = _CLIENT_CACHE[key] = _SharedDirectory(
+                chromadb.PersistentClient(
+                    path=key,
+                    settings=Settings(anonymized_telemetry=False)
+                )
+            )
+        return shared
+
+
+def on_release(hook: Callable[[], None]) -> None:
+    """
+    Register a function for release_clients to call.
+    
+    Modules that keep their own VectorDBManager (e.g. the workflow's shared
+    instance) register a cache reset here, so they never hand out a manager
+    whose client has been closed.
+    
+    Args:
+        hook: Zero-argument function, typically an lru_cache's cache_clear.
+    """
+    _RELEASE_HOOKS.append(hook)
+
+
+def release_clients() -> None:
+    """
+    Forget all cached clients and close their ChromaDB systems.
+    
+    Call this before deleting or replacing a database directory, so that a
+    directory recreated at the same path is not served by a stale client.
+    Functions registered with on_release are called first. Managers opened
+    earlier must not be used afterwards.
+    """
+    for hook in _RELEASE_HOOKS:
+        hook()
+    with _CLIENT_LOCK:
+        _CLIENT_CACHE.clear()
+        SharedSystemClient.clear_system_cache()
 
 
 class VectorDBManager:
@@ -71,9 +179,21 @@ class VectorDBManager:
         persist_directory: Path to directory where database is stored
         client: ChromaDB PersistentClient instance
         collection: ChromaDB collection for game theory documents
+        embedding_function: Embedding function used by the collection, also
+            used by embed_query so query vectors can be computed once and reused
+        _id_cache: Set of IDs known to be stored in the collection, kept
+            locally so duplicate chunks are skipped without a SQLite round-trip
+        _id_lock: Lock guarding _id_cache, shared with it per directory
+        _embedding_cache: LRU of query text to embedding, so repeated
+            queries skip the embedding model
     """
     
-    def __init__(self, persist_directory: str = "./chroma_db"):
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        warm_up: bool = True,
+        embedding_function: Optional[EmbeddingFunction] = None
+    ):
         """
         Initialize ChromaDB client with persistence.
         
@@ -83,27 +203,74 @@ class VectorDBManager:
         
         Args:
             persist_directory: Path to directory for database storage.
-                Directory is created if it doesn't exist. Default is "./chroma_db".
+                Directory is created if it doesn't exist. Default (None) is
+                default_persist_directory(): "./chroma_db", or
+                "./chroma_db_<worker>" inside a pytest-xdist worker.
                 All database files (SQLite, embeddings, etc.) are stored here.
+            warm_up: If True (default) and the collection is not empty, issue a
+                throwaway query in a background thread so the HNSW index,
+                SQLite pages, and embedding model are loaded before the first
+                real query.
+            embedding_function: Embedding function for the collection. Default
+                (None) is ChromaDB's DefaultEmbeddingFunction (all-MiniLM-L6-v2
+                via ONNX). Must match the function the collection was built
+                with, or stored and query vectors will not be comparable.
         
         Note:
             - Directory is created automatically if it doesn't exist
-            - Multiple instances pointing to the same directory share the same database
+            - Multiple instances pointing to the same directory share the same
+              database, client and ID cache (see release_clients)
             - Anonymized telemetry is disabled for privacy
+            - Warm-up runs on a daemon thread and never blocks construction
         """
+        if persist_directory is None:
+            persist_directory = default_persist_directory()
         self.persist_directory = persist_directory
         os.makedirs(persist_directory, exist_ok=True)
         
-        self.client = chromadb.PersistentClient(
-            path=persist_directory,
-            settings=Settings(anonymized_telemetry=False)
-        )
+        shared = _get_shared_directory(persist_directory)
+        self.client = shared.client
+        
+        # Keep a handle on the embedder so callers can embed queries once
+        if embedding_function is None:
+            embedding_function = DefaultEmbeddingFunction()
+        self.embedding_function = embedding_function
         
         # Get or create collection for game theory documents
         self.collection = self.client.get_or_create_collection(
             name="game_theory_docs",
-            metadata={"description": "Game theory papers and documents"}
+            metadata={"description": "Game theory papers and documents"},
+            embedding_function=self.embedding_function
         )
+        
+        # Seed the local ID cache from the existing collection (IDs only).
+        # It is shared per directory, so every manager sees the same IDs
+        with _CLIENT_LOCK:
+            if shared.ids is None:
+                shared.ids = set(self.collection.get(include=[])["ids"])
+        self._id_cache = shared.ids
+        self._id_lock = shared.ids_lock
+        
+        self._embedding_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._embedding_lock = threading.Lock()
+        
+        # Pre-load the index in the background; an empty collection has
+        # nothing to warm
+        if warm_up and self._id_cache:
+            threading.Thread(target=self._warm_up, daemon=True).start()
+    
+    def _warm_up(self) -> None:
+        """
+        Run a cheap throwaway query to pull index pages into memory.
+        
+        ChromaDB loads the HNSW index, SQLite pages, and the embedding model
+        lazily on first query. Running one query up front moves that
+        cold-start cost off the first pull_from_chroma call.
+        """
+        try:
+            self.collection.query(query_texts=[" "], n_results=1)
+        except Exception:
+            pass  # Warm-up is best effort
     
     def add_documents(
         self,
@@ -134,8 +301,12 @@ class VectorDBManager:
         
         Note:
             - ChromaDB automatically computes embeddings using a default embedder
+            - All documents are sent in one add call (split only when the list
+              exceeds Chroma's maximum batch size), so pass whole batches
+              rather than calling this once per paper
             - Documents are immediately persisted to disk
-            - If an ID already exists, the document is updated (not duplicated)
+            - Documents whose ID already exists are skipped (not duplicated);
+              existing IDs are checked against a local set, not the database
             - Metadata can be used for filtering queries later
         """
         # Validate that all lists have the same length
@@ -145,13 +316,115 @@ class VectorDBManager:
                 f"Got documents={len(documents)}, metadatas={len(metadatas)}, ids={len(ids)}"
             )
         
-        self.collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
+        # Keep only IDs not already stored (or repeated within this batch).
+        # They are claimed under the lock, so a concurrent writer skips them
+        new_indices = []
+        with self._id_lock:
+            for i, doc_id in enumerate(ids):
+                if doc_id not in self._id_cache:
+                    self._id_cache.add(doc_id)
+                    new_indices.append(i)
+        
+        if not new_indices:
+            return
+        
+        if len(new_indices) < len(ids):
+            documents = [documents[i] for i in new_indices]
+            metadatas = [metadatas[i] for i in new_indices]
+            ids = [ids[i] for i in new_indices]
+        
+        # Insert in as few calls as possible; Chroma caps the size of one add
+        batch_size = self.client.get_max_batch_size()
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            try:
+                self.collection.add(
+                    documents=documents[start:end],
+                    metadatas=metadatas[start:end],
+                    ids=ids[start:end]
+                )
+            except Exception:
+                # This batch and later ones were not stored; forget their IDs
+                # so a retry can add them. Only this call claimed them
+                with self._id_lock:
+                    self._id_cache.difference_update(ids[start:])
+                raise
     
-    def query(self, query_text: str, n_results: int = 3) -> Dict[str, Any]:
+    def embed_query(self, query_text: str) -> List[float]:
+        """
+        Compute the embedding for a query string.
+        
+        Uses the same embedding function as the collection, so the result can
+        be passed back to query() as query_embedding to skip re-embedding the
+        same text. The last EMBEDDING_CACHE_SIZE query embeddings are kept in
+        an LRU cache, so asking the same question again skips the model.
+        
+        Args:
+            query_text: Query string to embed.
+        
+        Returns:
+            Embedding vector as a list of floats. Cached vectors are shared
+            between callers and must not be modified.
+        """
+        with self._embedding_lock:
+            cached = self._embedding_cache.get(query_text)
+            if cached is not None:
+                self._embedding_cache.move_to_end(query_text)
+                return cached
+        
+        embedding = self.embedding_function([query_text])[0]
+        embedding = embedding.tolist() if hasattr(embedding, "tolist") else list(embedding)
+        
+        with self._embedding_lock:
+            self._embedding_cache[query_text] = embedding
+            if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                self._embedding_cache.popitem(last=False)
+        return embedding
+    
+    def embed_queries(self, query_texts: List[str]) -> List[List[float]]:
+        """
+        Compute embeddings for several query strings at once.
+        
+        Texts missing from the embed_query cache are embedded in a single
+        call to the embedding model and added to the cache, so a list of
+        queries known in advance can be warmed up before they are run.
+        
+        Example:
+            .. code-block:: python
+            
+                db.embed_queries(["What is game theory?", "Explain the prisoner's dilemma"])
+                # Later embed_query() calls for these texts hit the cache
+        
+        Args:
+            query_texts: Query strings to embed.
+        
+        Returns:
+            Embedding vectors in the same order as query_texts. Cached vectors
+            are shared between callers and must not be modified.
+        """
+        with self._embedding_lock:
+            missing = [
+                text for text in dict.fromkeys(query_texts)
+                if text not in self._embedding_cache
+            ]
+        
+        if missing:
+            embeddings = self.embedding_function(missing)
+            with self._embedding_lock:
+                for text, embedding in zip(missing, embeddings):
+                    embedding = embedding.tolist() if hasattr(embedding, "tolist") else list(embedding)
+                    self._embedding_cache[text] = embedding
+                    if len(self._embedding_cache) > EMBEDDING_CACHE_SIZE:
+                        self._embedding_cache.popitem(last=False)
+        
+        return [self.embed_query(text) for text in query_texts]
+    
+    def query(
+        self,
+        query_text: str,
+        n_results: int = 3,
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, Any]:
         """
         Query the vector database for relevant documents.
         
@@ -164,6 +437,8 @@ class VectorDBManager:
                 against all stored document embeddings using cosine similarity.
             n_results: Number of top results to return. Default is 3. Results are
                 sorted by similarity (most similar first).
+            query_embedding: Optional precomputed embedding of query_text (see
+                embed_query). When given, ChromaDB skips embedding the text.
         
         Returns:
             Dictionary containing query results with structure:
@@ -191,12 +466,96 @@ class VectorDBManager:
             - If fewer than n_results documents exist, all available are returned
             - Empty list is returned if no documents match or database is empty
         """
+        if query_embedding is not None:
+            return self.collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                include=QUERY_INCLUDE
+            )
+        
         results = self.collection.query(
             query_texts=[query_text],
-            n_results=n_results
+            n_results=n_results,
+            include=QUERY_INCLUDE
         )
         return results
     
+    def query_batch(
+        self,
+        query_texts: List[str],
+        n_results: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Query the vector database with several query strings at once.
+        
+        Issues a single ChromaDB query for all query strings, so the
+        embedding model runs one batched forward pass and the index reads are
+        shared, instead of one round-trip per query. Useful when a question is
+        expanded into several sub-queries.
+        
+        Args:
+            query_texts: List of search query strings.
+            n_results: Number of top results to return per query. Default is 3.
+        
+        Returns:
+            Dictionary with the same keys as query(), where the outer list has
+            one entry per query string (in input order):
+            {
+                "ids": [[str, ...], ...],
+                "documents": [[str, ...], ...],
+                "metadatas": [[Dict, ...], ...],
+                "distances": [[float, ...], ...]
+            }
+        
+        Example:
+            .. code-block:: python
+            
+                results = db.query_batch(["Nash equilibrium", "minimax"])
+                nash_docs = results["documents"][0]
+                minimax_docs = results["documents"][1]
+        """
+        return self.collection.query(
+            query_texts=query_texts,
+            n_results=n_results,
+            include=QUERY_INCLUDE
+        )
+    
+    def has_document(self, doc_id: str) -> bool:
+        """
+        Check whether a document ID is already stored in the collection.
+        
+        Uses the in-memory ID cache, so no database round-trip is made.
+        
+        Args:
+            doc_id: Document ID to look up.
+        
+        Returns:
+            True if the ID has been added to the collection, False otherwise.
+        """
+        return doc_id in self._id_cache
+    
+    def clear(self) -> None:
+        """
+        Delete every document from the collection.
+        
+        The client, collection and embedding model stay loaded, so this is
+        much cheaper than opening a new VectorDBManager on a fresh directory
+        (e.g. to isolate tests). The query embedding cache is kept, since
+        embeddings do not depend on the stored documents.
+        
+        Example:
+            .. code-block:: python
+            
+                db.clear()
+                assert db.count() == 0
+        """
+        ids = self.collection.get(include=[])["ids"]
+        batch_size = self.client.get_max_batch_size()
+        for start in range(0, len(ids), batch_size):
+            self.collection.delete(ids=ids[start:start + batch_size])
+        with self._id_lock:
+            self._id_cache.clear()
+    
     def count(self) -> int:
         """
         Return the number of documents in the collection.
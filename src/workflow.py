@@ -29,15 +29,17 @@ Architecture:
 Dependency Graph:
     Nodes and their tool dependencies:
     
-    - check_needs_context: [llm]
-    - check_relevance: [llm]
+    - check_needs_context: [batcher]
+    - check_relevance: [batcher]
     - pull_from_chroma: [vector_db]
     - search_arxiv: [arxiv_searcher]
     - add_to_chroma: [vector_db, doc_processor]  # Multi-tool dependency
     - generate_response: [llm]
 
 Shared Tools:
-    - llm: Used by 3 nodes (context checking, relevance, response)
+    - llm: Used by 2 nodes (paper filtering, response)
+    - batcher: LLMBatcher around llm, used by the classifier nodes so that
+      concurrent queries share batched LLM calls
     - vector_db: Used by 2 nodes (retrieval, storage)
     - arxiv_searcher: Used by 1 node (search)
     - doc_processor: Used by 1 node (processing)
@@ -48,26 +50,33 @@ This architecture makes it easy to:
     - Test nodes: Pure functions with injected dependencies
     - Extend workflow: Add new nodes and wire them to the graph
 """
-from typing import Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, Iterator, Optional, Tuple
 from langgraph.graph import StateGraph, END
 from langchain_core.language_models import BaseChatModel
+import logging
 import os
 from dotenv import load_dotenv
 
 from src.state import GraphState
-from src.vector_db import VectorDBManager
+from src.vector_db import VectorDBManager, on_release
 from src.arxiv_search import ArxivSearcher
 from src.document_processor import DocumentProcessor
 from src.graph_builder import WorkflowBuilder
+from src.llm_batcher import LLMBatcher
 
 # Import nodes
 from src.nodes import (
     check_relevance,
+    acheck_relevance,
     pull_from_chroma,
     search_arxiv,
     filter_game_theory_papers,
+    afilter_game_theory_papers,
     add_to_chroma,
-    generate_response
+    generate_response,
+    agenerate_response
 )
 
 # Import routers
@@ -79,6 +88,153 @@ from src.edges import (
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Dependency registry keys; must match type hint class names in node functions
+DEPENDENCY_KEYS = (
+    "BaseChatModel",
+    "VectorDBManager",
+    "ArxivSearcher",
+    "DocumentProcessor",
+    "LLMBatcher",
+)
+
+
+# Process-wide tool instances. Opening the Chroma client and loading its
+# index is slow, and the tools hold no per-query state, so every
+# GameTheoryRAG instance in the process shares them.
+@lru_cache(maxsize=1)
+def _get_vector_db() -> VectorDBManager:
+    """Return the shared VectorDBManager (default persist directory)."""
+    return VectorDBManager()
+
+
+# release_clients() closes the manager's client; open a new one next time
+on_release(_get_vector_db.cache_clear)
+
+
+@lru_cache(maxsize=1)
+def _get_doc_processor() -> DocumentProcessor:
+    """Return the shared DocumentProcessor (default chunking settings)."""
+    return DocumentProcessor()
+
+
+@lru_cache(maxsize=8)
+def _get_arxiv_searcher(max_results: int) -> ArxivSearcher:
+    """Return the shared ArxivSearcher for a given max_results."""
+    return ArxivSearcher(max_results=max_results)
+
+
+def shared_arxiv_searcher(max_results: int = 2) -> ArxivSearcher:
+    """
+    Return the ArxivSearcher that GameTheoryRAG instances use.
+    
+    Lets callers search arxiv with the workflow's own searcher without
+    building a GameTheoryRAG (and its LLM and vector DB) first.
+    
+    Args:
+        max_results: Papers per search, as GameTheoryRAG's max_arxiv_results.
+            Default is 2, the same default.
+    
+    Returns:
+        The process-wide searcher for that max_results.
+    """
+    return _get_arxiv_searcher(max_results)
+
+
+def build_graph(builder: WorkflowBuilder) -> StateGraph:
+    """
+    Build the uncompiled LangGraph workflow topology.
+    
+    The topology (nodes, entry point, edges) is the same for every
+    GameTheoryRAG instance; only the injected tools differ. Keeping it in a
+    module-level function makes the graph shape reusable without an instance.
+    
+    Args:
+        builder: WorkflowBuilder holding the dependency registry used to wrap
+            each node function.
+    
+    Returns:
+        Uncompiled StateGraph instance ready for visualization or compilation.
+    """
+    workflow = StateGraph(GraphState)
+    
+    # Add nodes with automatic dependency injection
+    # The builder automatically injects dependencies based on function signatures
+    workflow.add_node(
+        "pull_from_chroma",
+        builder.create_node(pull_from_chroma)
+        # Dependencies: vector_db (VectorDBManager)
+    )
+    
+    workflow.add_node(
+        "check_relevance",
+        builder.create_node(check_relevance, acheck_relevance)
+        # Dependencies: batcher (LLMBatcher)
+    )
+    
+    workflow.add_node(
+        "search_arxiv",
+        builder.create_node(search_arxiv)
+        # Dependencies: arxiv_searcher (ArxivSearcher)
+    )
+    
+    workflow.add_node(
+        "filter_game_theory_papers",
+        builder.create_node(filter_game_theory_papers, afilter_game_theory_papers)
+        # Dependencies: llm (BaseChatModel)
+    )
+    
+    workflow.add_node(
+        "add_to_chroma",
+        builder.create_node(add_to_chroma)
+        # Dependencies: vector_db (VectorDBManager), doc_processor (DocumentProcessor)
+    )
+    
+    workflow.add_node(
+        "generate_response",
+        builder.create_node(generate_response, agenerate_response)
+        # Dependencies: llm (BaseChatModel)
+    )
+    
+    # Set entry point - always start with vector DB retrieval
+    workflow.set_entry_point("pull_from_chroma")
+    
+    # After pulling from Chroma, check relevance
+    workflow.add_edge("pull_from_chroma", "check_relevance")
+    
+    # Add conditional edges after relevance check
+    workflow.add_conditional_edges(
+        "check_relevance",
+        route_after_relevance_check,
+        {
+            "generate_response": "generate_response",
+            "search_arxiv": "search_arxiv"
+        }
+    )
+    
+    # After searching arxiv, filter papers for game theory relevance
+    workflow.add_edge("search_arxiv", "filter_game_theory_papers")
+    
+    # After filtering, route based on whether game theory papers were found
+    workflow.add_conditional_edges(
+        "filter_game_theory_papers",
+        route_after_paper_filter,
+        {
+            "add_to_chroma": "add_to_chroma",
+            "generate_response": "generate_response"
+        }
+    )
+    
+    # After adding to chroma, loop back to pull from chroma
+    # This creates a self-improving workflow that re-queries after adding papers
+    workflow.add_edge("add_to_chroma", "pull_from_chroma")
+    
+    # Generate response ends the workflow
+    workflow.add_edge("generate_response", END)
+    
+    return workflow
+
 
 class GameTheoryRAG:
     """
@@ -116,6 +272,27 @@ class GameTheoryRAG:
             rag = GameTheoryRAG(llm=llm)
     """
     
+    # Compiled workflows shared across instances, keyed by the identity of the
+    # injected tools. Values keep the tools alive so their ids stay unique.
+    _compiled_workflows: ClassVar[Dict[Tuple[int, ...], Tuple[Tuple[Any, ...], Any]]] = {}
+    _MAX_COMPILED_WORKFLOWS: ClassVar[int] = 8
+    
+    # Read-only template for the state each query starts from. Nodes replace
+    # the list/dict values rather than mutating them, so a shallow copy per
+    # query is safe.
+    _INITIAL_STATE_TEMPLATE: ClassVar[MappingProxyType] = MappingProxyType({
+        "user_query": "",
+        "needs_context": False,
+        "chroma_results": {},
+        "query_embedding": [],
+        "relevant_context": False,
+        "arxiv_papers": [],
+        "papers_added": False,
+        "downloaded_pdfs": [],
+        "papers_seen": [],
+        "final_response": ""
+    })
+    
     def __init__(
         self,
         llm: Optional[BaseChatModel] = None,
@@ -202,19 +379,25 @@ class GameTheoryRAG:
                 )
                 print("Using OpenAI LLM: gpt-3.5-turbo")
         
-        # Initialize component dependencies
-        self.vector_db = VectorDBManager()
-        self.arxiv_searcher = ArxivSearcher(max_results=max_arxiv_results)
-        self.doc_processor = DocumentProcessor()
+        # Initialize component dependencies (shared across instances)
+        self.vector_db = _get_vector_db()
+        self.arxiv_searcher = _get_arxiv_searcher(max_arxiv_results)
+        self.doc_processor = _get_doc_processor()
         
-        # Set up dependency registry for builder
-        # Keys must match type hint class names in node functions
+        # Set up dependency registry for builder (keys as in DEPENDENCY_KEYS)
         self.dependencies = {
             "BaseChatModel": self.llm,
             "VectorDBManager": self.vector_db,
             "ArxivSearcher": self.arxiv_searcher,
             "DocumentProcessor": self.doc_processor,
+            "LLMBatcher": LLMBatcher.for_llm(
+                self.llm, max_tokens=self._classifier_max_tokens(self.llm)
+            ),
         }
+        # graph_only() builds from DEPENDENCY_KEYS; the two must not drift
+        assert self.dependencies.keys() == set(DEPENDENCY_KEYS), (
+            "dependency registry and DEPENDENCY_KEYS differ"
+        )
         
         # Create workflow builder with dependencies
         self.builder = WorkflowBuilder(self.dependencies)
@@ -222,6 +405,23 @@ class GameTheoryRAG:
         # Build the workflow
         self.workflow = self._build_workflow()
     
+    @staticmethod
+    def _classifier_max_tokens(llm: BaseChatModel) -> Optional[int]:
+        """
+        Output token limit for the yes/no classifier nodes.
+        
+        Classifiers only need the first token of the reply, so calls are
+        capped at one token when the model exposes a max_tokens setting
+        (e.g. ChatOpenAI). Models without one are called unchanged.
+        
+        Args:
+            llm: The chat model used by the classifier nodes.
+        
+        Returns:
+            1 if the model supports max_tokens, None otherwise.
+        """
+        return 1 if hasattr(llm, "max_tokens") else None
+    
     def _build_workflow_uncompiled(self) -> StateGraph:
         """
         Build the LangGraph workflow (uncompiled version for visualization).
@@ -233,83 +433,7 @@ class GameTheoryRAG:
         Returns:
             Uncompiled StateGraph instance ready for visualization or compilation.
         """
-        workflow = StateGraph(GraphState)
-        
-        # Add nodes with automatic dependency injection
-        # The builder automatically injects dependencies based on function signatures
-        workflow.add_node(
-            "pull_from_chroma",
-            self.builder.create_node(pull_from_chroma)
-            # Dependencies: vector_db (VectorDBManager)
-        )
-        
-        workflow.add_node(
-            "check_relevance",
-            self.builder.create_node(check_relevance)
-            # Dependencies: llm (BaseChatModel)
-        )
-        
-        workflow.add_node(
-            "search_arxiv",
-            self.builder.create_node(search_arxiv)
-            # Dependencies: arxiv_searcher (ArxivSearcher)
-        )
-        
-        workflow.add_node(
-            "filter_game_theory_papers",
-            self.builder.create_node(filter_game_theory_papers)
-            # Dependencies: llm (BaseChatModel)
-        )
-        
-        workflow.add_node(
-            "add_to_chroma",
-            self.builder.create_node(add_to_chroma)
-            # Dependencies: vector_db (VectorDBManager), doc_processor (DocumentProcessor)
-        )
-        
-        workflow.add_node(
-            "generate_response",
-            self.builder.create_node(generate_response)
-            # Dependencies: llm (BaseChatModel)
-        )
-        
-        # Set entry point - always start with vector DB retrieval
-        workflow.set_entry_point("pull_from_chroma")
-        
-        # After pulling from Chroma, check relevance
-        workflow.add_edge("pull_from_chroma", "check_relevance")
-        
-        # Add conditional edges after relevance check
-        workflow.add_conditional_edges(
-            "check_relevance",
-            route_after_relevance_check,
-            {
-                "generate_response": "generate_response",
-                "search_arxiv": "search_arxiv"
-            }
-        )
-        
-        # After searching arxiv, filter papers for game theory relevance
-        workflow.add_edge("search_arxiv", "filter_game_theory_papers")
-        
-        # After filtering, route based on whether game theory papers were found
-        workflow.add_conditional_edges(
-            "filter_game_theory_papers",
-            route_after_paper_filter,
-            {
-                "add_to_chroma": "add_to_chroma",
-                "generate_response": "generate_response"
-            }
-        )
-        
-        # After adding to chroma, loop back to pull from chroma
-        # This creates a self-improving workflow that re-queries after adding papers
-        workflow.add_edge("add_to_chroma", "pull_from_chroma")
-        
-        # Generate response ends the workflow
-        workflow.add_edge("generate_response", END)
-        
-        return workflow
+        return build_graph(self.builder)
     
     def _build_workflow(self) -> StateGraph:
         """
@@ -318,15 +442,30 @@ class GameTheoryRAG:
         This method creates the workflow graph and compiles it for execution.
         It also enables Phoenix/LangSmith tracing if configured.
         
+        The graph topology is static, so compilation is done once per set of
+        injected tools and shared by every instance that uses the same tool
+        objects (for example, instances constructed around one shared LLM).
+        
         Returns:
             Compiled StateGraph ready for execution.
         """
-        compiled = self._build_workflow_uncompiled().compile()
+        tools = tuple(self.dependencies.values())
+        key = tuple(id(tool) for tool in tools)
+        cached = GameTheoryRAG._compiled_workflows.get(key)
+        if cached is not None:
+            compiled = cached[1]
+        else:
+            compiled = self._build_workflow_uncompiled().compile()
+            if len(GameTheoryRAG._compiled_workflows) >= self._MAX_COMPILED_WORKFLOWS:
+                # Evict the oldest entry (dicts preserve insertion order)
+                oldest = next(iter(GameTheoryRAG._compiled_workflows))
+                del GameTheoryRAG._compiled_workflows[oldest]
+            GameTheoryRAG._compiled_workflows[key] = (tools, compiled)
         
         # Enable Phoenix/LangSmith tracing if available
         try:
             if os.getenv("LANGCHAIN_TRACING_V2", "false").lower() == "true":
-                print("Tracing enabled (Phoenix/LangSmith compatible)")
+                logger.info("Tracing enabled (Phoenix/LangSmith compatible)")
         except Exception:
             pass  # Tracing is optional
         
@@ -344,6 +483,40 @@ class GameTheoryRAG:
         """
         return self._build_workflow_uncompiled()
     
+    @classmethod
+    def graph_only(cls) -> StateGraph:
+        """
+        Build the uncompiled workflow graph without creating any tools.
+        
+        Drawing the graph only needs its nodes and edges, so every dependency
+        is registered as None: no LLM client, vector DB or embedding model
+        is created. The returned graph cannot be run.
+        
+        Returns:
+            Uncompiled StateGraph with the same topology as get_graph().
+        
+        Example:
+            .. code-block:: python
+            
+                graph = GameTheoryRAG.graph_only().compile().get_graph()
+                print(graph.draw_mermaid())
+        """
+        return build_graph(WorkflowBuilder(dict.fromkeys(DEPENDENCY_KEYS)))
+    
+    def _initial_state(self, user_query: str) -> GraphState:
+        """
+        Create the initial workflow state for a user query.
+        
+        Args:
+            user_query: The user's question as a string.
+        
+        Returns:
+            GraphState with the query set and all other fields empty.
+        """
+        state = dict(self._INITIAL_STATE_TEMPLATE)
+        state["user_query"] = user_query
+        return state
+    
     def query(self, user_query: str) -> str:
         """
         Process a user query through the workflow.
@@ -366,21 +539,92 @@ class GameTheoryRAG:
                 print(response)
                 # Output: "Nash equilibrium is a concept in game theory..."
         """
-        initial_state: GraphState = {
-            "user_query": user_query,
-            "needs_context": False,
-            "chroma_results": {},
-            "relevant_context": False,
-            "arxiv_papers": [],
-            "papers_added": False,
-            "downloaded_pdfs": [],
-            "papers_seen": [],
-            "final_response": ""
-        }
+        initial_state = self._initial_state(user_query)
         
-        print(f"\n{'='*60}")
-        print(f"Processing query: {user_query}")
-        print(f"{'='*60}\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n%s\nProcessing query: %s\n%s\n", "=" * 60, user_query, "=" * 60)
         
         final_state = self.workflow.invoke(initial_state)
         return final_state["final_response"]
+    
+    async def aquery(self, user_query: str) -> str:
+        """
+        Process a user query through the workflow asynchronously.
+        
+        Async counterpart of :meth:`query`. The LLM-bound nodes run their
+        ``async`` variants (relevance check, concurrent paper filtering,
+        streamed answer generation), and the vector DB / arxiv nodes run in
+        LangGraph's thread pool, so many queries can be awaited concurrently
+        from one event loop.
+        
+        Args:
+            user_query: The user's question as a string.
+        
+        Returns:
+            The final answer string generated by the workflow.
+        
+        Example:
+            .. code-block:: python
+            
+                rag = GameTheoryRAG()
+                answers = await asyncio.gather(
+                    rag.aquery("What is Nash equilibrium?"),
+                    rag.aquery("Explain the prisoner's dilemma"),
+                )
+        """
+        initial_state = self._initial_state(user_query)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n%s\nProcessing query (async): %s\n%s\n", "=" * 60, user_query, "=" * 60)
+        
+        final_state = await self.workflow.ainvoke(initial_state)
+        return final_state["final_response"]
+    
+    def query_stream(self, user_query: str) -> Iterator[str]:
+        """
+        Process a user query through the workflow, yielding the answer as it
+        is generated.
+        
+        Mirrors :meth:`query`, but runs the graph with LangGraph's "messages"
+        stream mode and yields the LLM token chunks emitted by the
+        generate_response node. Earlier nodes (retrieval, relevance checks,
+        arxiv search) run to completion as usual; only the final answer is
+        streamed. If the answer is not produced by the LLM (e.g. the fallback
+        message when no context is found), it is yielded as a single chunk.
+        
+        Args:
+            user_query: The user's question as a string.
+        
+        Yields:
+            Pieces of the final answer string, in order. Joining them gives
+            the same string :meth:`query` would return.
+        
+        Example:
+            .. code-block:: python
+            
+                rag = GameTheoryRAG()
+                for token in rag.query_stream("What is Nash equilibrium?"):
+                    print(token, end="", flush=True)
+        """
+        initial_state = self._initial_state(user_query)
+        
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n%s\nProcessing query (streaming): %s\n%s\n", "=" * 60, user_query, "=" * 60)
+        
+        streamed = False
+        final_state = initial_state
+        for mode, payload in self.workflow.stream(
+            initial_state, stream_mode=["messages", "values"]
+        ):
+            if mode == "values":
+                final_state = payload
+                continue
+            chunk, metadata = payload
+            if metadata.get("langgraph_node") != "generate_response":
+                continue
+            if chunk.content:
+                streamed = True
+                yield chunk.content
+        
+        if not streamed and final_state.get("final_response"):
+            yield final_state["final_response"]
@@ -0,0 +1,35 @@
+"""
+Console output helpers for the integration test scripts.
+"""
+import sys
+
+
+def banner(
+    title: str,
+    char: str = "=",
+    width: int = 60,
+    blank_before: bool = False,
+    blank_after: bool = False
+) -> None:
+    """
+    Print a title between two separator lines in a single write.
+    
+    Args:
+        title: Text shown between the separators.
+        char: Character the separator lines are made of. Default is "=".
+        width: Length of the separator lines. Default is 60.
+        blank_before: Print an empty line before the banner.
+        blank_after: Print an empty line after the banner.
+    
+    Example:
+        .. code-block:: python
+        
+            banner("Running Test Queries", blank_before=True)
+            # ============================================================
+            # Running Test Queries
+            # ============================================================
+    """
+    sep = char * width
+    before = "\n" if blank_before else ""
+    after = "\n" if blank_after else ""
+    sys.stdout.write(f"{before}{sep}\n{title}\n{sep}\n{after}")
@@ -0,0 +1,106 @@
+"""
+Shared GameTheoryRAG construction for the integration tests.
+
+The integration scripts pick an LLM backend from the same environment
+variables. This module reads them once and builds the matching
+GameTheoryRAG, so each script does not repeat the selection logic. It
+also provides warmup(), which pre-computes the test queries' embeddings.
+
+Environment variables:
+    OPENAI_API_KEY: OpenAI API key. Used when USE_LOCAL_LLM is not "true".
+    USE_LOCAL_LLM: "true" to use Ollama instead of OpenAI.
+    LOCAL_LLM_BASE_URL: OpenAI-compatible endpoint used when neither of
+        the above is set. Default is LM Studio at http://localhost:1234/v1.
+    LOCAL_LLM_MODEL: Model name for that endpoint. Default is "local-model".
+"""
+from functools import lru_cache
+from typing import List, NamedTuple, Optional
+import os
+
+from src.workflow import GameTheoryRAG
+
+
+class LLMEnv(NamedTuple):
+    """LLM settings read from the environment."""
+    api_key: Optional[str]
+    use_local: bool
+    local_base_url: str
+    local_model: str
+    
+    @property
+    def backend(self) -> str:
+        """
+        Name of the backend the settings select.
+        
+        Returns:
+            "ollama" if USE_LOCAL_LLM is set, otherwise "openai" if an API key
+            is set, otherwise "lm_studio".
+        """
+        if self.use_local:
+            return "ollama"
+        if self.api_key:
+            return "openai"
+        return "lm_studio"
+
+
+@lru_cache(maxsize=1)
+def llm_env() -> LLMEnv:
+    """
+    Read the LLM settings from the environment.
+    
+    The result is cached, so call load_dotenv() before the first call.
+    
+    Returns:
+        LLMEnv with the current settings.
+    """
+    return LLMEnv(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        use_local=os.getenv("USE_LOCAL_LLM", "false").lower() == "true",
+        local_base_url=os.getenv("LOCAL_LLM_BASE_URL", "http://localhost:1234/v1"),
+        local_model=os.getenv("LOCAL_LLM_MODEL", "local-model"),
+    )
+
+
+def build_rag_from_env() -> GameTheoryRAG:
+    """
+    Create a GameTheoryRAG for the backend selected by the environment.
+    
+    Returns:
+        GameTheoryRAG using Ollama, OpenAI or LM Studio (see llm_env()).
+    
+    Example:
+        .. code-block:: python
+        
+            load_dotenv()
+            rag = build_rag_from_env()
+            print(rag.query("What is Nash equilibrium?"))
+    """
+    env = llm_env()
+    if env.backend == "ollama":
+        return GameTheoryRAG(use_local_llm=True)
+    if env.backend == "openai":
+        return GameTheoryRAG(openai_api_key=env.api_key)
+    return GameTheoryRAG(
+        local_llm_base_url=env.local_base_url,
+        local_llm_model=env.local_model,
+        openai_api_key="lm-studio"  # LM Studio doesn't require real key
+    )
+
+
+def warmup(rag: GameTheoryRAG, test_queries: List[str]) -> None:
+    """
+    Embed every test query in one model call before the queries run.
+    
+    The queries then reuse the cached vectors instead of each calling the
+    embedding model. This is only an optimization: if embedding fails (e.g.
+    the model cannot be downloaded), a warning is printed and the script
+    carries on, leaving the error to surface from the query itself.
+    
+    Args:
+        rag: GameTheoryRAG the queries will run through.
+        test_queries: Query strings to embed.
+    """
+    try:
+        rag.vector_db.embed_queries(test_queries)
+    except Exception as e:
+        print(f"⚠ Could not warm up query embeddings: {type(e).__name__}: {e}")
@@ -1,16 +1,14 @@
 """
 Test the Game Theory RAG system with LM Studio (OpenAI-compatible endpoint).
 """
+import logging
 import sys
-from src.workflow import GameTheoryRAG
+from tests._console import banner
 
 
 def test_lm_studio():
     """Test the RAG system with LM Studio."""
-    print("="*60)
-    print("LM Studio Test - Game Theory RAG System")
-    print("="*60)
-    print()
+    banner("LM Studio Test - Game Theory RAG System", blank_after=True)
     
     # LM Studio default settings
     base_url = "http://localhost:1234/v1"  # LM Studio default
@@ -31,9 +29,11 @@ def test_lm_studio():
         print("\nCancelled.")
         sys.exit(0)
     
-    print("\n" + "-"*60)
-    print("Initializing RAG system with LM Studio...")
-    print("-"*60)
+    banner("Initializing RAG system with LM Studio...", "-", blank_before=True)
+    
+    # Imported here so the prompts above show without loading LangChain and ChromaDB
+    from src.workflow import GameTheoryRAG
+    from tests._rag_factory import warmup
     
     try:
         rag = GameTheoryRAG(
@@ -50,40 +50,35 @@ def test_lm_studio():
         print("  4. Try updating the model name to match what's in LM Studio")
         sys.exit(1)
     
-    print("\n" + "="*60)
-    print("Running Test Queries")
-    print("="*60)
-    print()
+    banner("Running Test Queries", blank_before=True, blank_after=True)
     
     # Test queries (simple ones to start)
     test_queries = [
         "What is game theory?",  # Should trigger arxiv search on first run
     ]
     
+    warmup(rag, test_queries)
+    
     for i, query in enumerate(test_queries, 1):
-        print(f"\n{'='*60}")
-        print(f"Test Query {i}: {query}")
-        print("="*60)
-        print()
+        banner(f"Test Query {i}: {query}", blank_before=True, blank_after=True)
         
         try:
             response = rag.query(query)
-            print(f"\n{'─'*60}")
-            print("RESPONSE:")
-            print(f"{'─'*60}")
-            print(response)
-            print()
         except Exception as e:
-            print(f"\n✗ Error processing query: {e}")
-            import traceback
-            traceback.print_exc()
+            banner("ERROR:", "─", blank_before=True)
+            print(f"✗ Error processing query: {type(e).__name__}: {e}")
+            print()
             break
+        
+        banner("RESPONSE:", "─", blank_before=True)
+        print(response)
+        print()
     
-    print("\n" + "="*60)
-    print("Test Complete!")
-    print("="*60)
+    banner("Test Complete!", blank_before=True)
 
 
 if __name__ == "__main__":
+    # Show the workflow's node and routing trace
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_lm_studio()
 
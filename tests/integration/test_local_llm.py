@@ -1,8 +1,40 @@
 """
 Test the Game Theory RAG system with a local LLM (Ollama).
 """
+import asyncio
+import logging
 import sys
-from src.workflow import GameTheoryRAG
+from tests._console import banner
+
+
+# Ollama serves two requests in parallel by default; more would just queue
+MAX_CONCURRENT_QUERIES = 2
+
+
+async def _run_queries(rag, queries, max_concurrency=MAX_CONCURRENT_QUERIES):
+    """
+    Run queries through rag.aquery(): the first alone, the rest concurrently.
+    
+    The first query runs on its own so that it warms up the model and fills
+    the vector database before the others check it for cached papers.
+    
+    Returns:
+        One entry per query, in order: the response string, or the exception
+        the query raised.
+    """
+    try:
+        first = await rag.aquery(queries[0])
+    except Exception as e:
+        first = e
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run(query):
+        async with semaphore:
+            return await rag.aquery(query)
+    
+    rest = await asyncio.gather(*(run(query) for query in queries[1:]), return_exceptions=True)
+    return [first] + rest
 
 
 def check_ollama_installed():
@@ -39,10 +71,7 @@ def check_ollama_installed():
 
 def test_local_llm():
     """Test the RAG system with local LLM."""
-    print("="*60)
-    print("Local LLM Test - Game Theory RAG System")
-    print("="*60)
-    print()
+    banner("Local LLM Test - Game Theory RAG System", blank_after=True)
     
     # Check Ollama
     if not check_ollama_installed():
@@ -59,9 +88,11 @@ def test_local_llm():
         print("  Install with: pip install langchain-ollama")
         sys.exit(1)
     
-    print("\n" + "-"*60)
-    print("Initializing RAG system with local LLM...")
-    print("-"*60)
+    banner("Initializing RAG system with local LLM...", "-", blank_before=True)
+    
+    # Imported here so the checks above run without loading LangChain and ChromaDB
+    from src.workflow import GameTheoryRAG
+    from tests._rag_factory import warmup
     
     # Initialize with local LLM
     # Try common model names
@@ -87,10 +118,7 @@ def test_local_llm():
         print("  Pull a model with: ollama pull llama3.2")
         sys.exit(1)
     
-    print("\n" + "="*60)
-    print("Running Test Queries")
-    print("="*60)
-    print()
+    banner("Running Test Queries", blank_before=True, blank_after=True)
     
     # Test queries (simple ones to start)
     test_queries = [
@@ -98,32 +126,31 @@ def test_local_llm():
         "Explain the prisoner's dilemma"  # Should use cached data
     ]
     
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n{'='*60}")
-        print(f"Test Query {i}: {query}")
-        print("="*60)
-        print()
+    warmup(rag, test_queries)
+    
+    # Later queries run concurrently; results are printed in the original order
+    results = asyncio.run(_run_queries(rag, test_queries))
+    
+    for i, (query, result) in enumerate(zip(test_queries, results), 1):
+        banner(f"Test Query {i}: {query}", blank_before=True, blank_after=True)
         
-        try:
-            response = rag.query(query)
-            print(f"\n{'─'*60}")
-            print("RESPONSE:")
-            print(f"{'─'*60}")
-            print(response)
+        if isinstance(result, Exception):
+            banner("ERROR:", "─", blank_before=True)
+            print(f"✗ Error processing query: {type(result).__name__}: {result}")
+            print()
+        else:
+            banner("RESPONSE:", "─", blank_before=True)
+            print(result)
             print()
-        except Exception as e:
-            print(f"\n✗ Error processing query: {e}")
-            import traceback
-            traceback.print_exc()
     
-    print("\n" + "="*60)
-    print("Test Complete!")
-    print("="*60)
+    banner("Test Complete!", blank_before=True)
     print(f"\nUsed model: {model_used}")
     print("\nYou can visualize the graph by running:")
     print("  python visualize_graph.py")
 
 
 if __name__ == "__main__":
+    # Show the workflow's node and routing trace
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_local_llm()
 
@@ -3,42 +3,67 @@ Test the Game Theory RAG system with Phoenix observability/tracing.
 
 This script automatically starts Phoenix and runs with LM Studio (default local LLM).
 """
+import logging
 import os
+import socket
 import sys
 import subprocess
 import time
-import urllib.request
-from dotenv import load_dotenv
 
 # Set tracing BEFORE any LangChain imports
-os.environ["LANGCHAIN_TRACING_V2"] = "true"
-os.environ["LANGCHAIN_ENDPOINT"] = "http://localhost:6006"
-os.environ["LANGCHAIN_API_KEY"] = "phoenix"  # Dummy key for Phoenix
+TRACING_ENV = {
+    "LANGCHAIN_TRACING_V2": "true",
+    "LANGCHAIN_ENDPOINT": "http://localhost:6006",
+    "LANGCHAIN_API_KEY": "phoenix",  # Dummy key for Phoenix
+}
+os.environ.update(TRACING_ENV)
 
-from src.workflow import GameTheoryRAG
+from tests._console import banner
+
+
+PHOENIX_ADDRESS = ("127.0.0.1", 6006)
+
+
+def _wait_phoenix(timeout: float = 10.0, interval: float = 0.1) -> bool:
+    """
+    Wait until something accepts TCP connections on the Phoenix port.
+    
+    A plain connect is enough to tell that the server is up and is much
+    cheaper than an HTTP request to /health. At least one attempt is made,
+    so ``timeout=0`` checks once without waiting.
+    
+    Args:
+        timeout: Seconds to keep trying. Default is 10.
+        interval: Seconds between attempts. Default is 0.1.
+    
+    Returns:
+        True if the port accepted a connection before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.settimeout(0.05)
+            if probe.connect_ex(PHOENIX_ADDRESS) == 0:
+                return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
 
 
 def test_with_phoenix():
     """Test the RAG system with Phoenix tracing enabled."""
-    print("="*60)
-    print("Phoenix Observability Test - Game Theory RAG System")
-    print("="*60)
-    print()
+    banner("Phoenix Observability Test - Game Theory RAG System", blank_after=True)
     
+    from dotenv import load_dotenv
     load_dotenv()
     
     print("Starting Phoenix server automatically...")
     print("-" * 60)
     
     # Check if Phoenix is already running
-    phoenix_running = False
-    try:
-        response = urllib.request.urlopen("http://localhost:6006/health", timeout=2)
-        if response.status == 200:
-            phoenix_running = True
-            print("✓ Phoenix server is already running")
-    except Exception:
-        pass
+    phoenix_running = _wait_phoenix(timeout=0)
+    if phoenix_running:
+        print("✓ Phoenix server is already running")
     
     # Start Phoenix if not running
     phoenix_process = None
@@ -46,25 +71,21 @@ def test_with_phoenix():
         print("Starting Phoenix server on port 6006...")
         try:
             # Try using python module approach (most reliable)
+            # In its own session, so the server outlives this script (and a
+            # Ctrl+C aimed at it) and its UI stays available afterwards
             phoenix_process = subprocess.Popen(
                 [sys.executable, "-m", "phoenix", "serve"],
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL,
-                env=os.environ.copy()
+                close_fds=True,
+                start_new_session=True
             )
             
-            # Wait for Phoenix to start (check health endpoint)
-            max_wait = 10
-            for i in range(max_wait):
-                time.sleep(1)
-                try:
-                    response = urllib.request.urlopen("http://localhost:6006/health", timeout=1)
-                    if response.status == 200:
-                        phoenix_running = True
-                        print(f"✓ Phoenix server started successfully (took {i+1}s)")
-                        break
-                except Exception:
-                    continue
+            # Wait for Phoenix to start accepting connections
+            start = time.monotonic()
+            phoenix_running = _wait_phoenix(timeout=10)
+            if phoenix_running:
+                print(f"✓ Phoenix server started successfully (took {time.monotonic() - start:.1f}s)")
             
             if not phoenix_running:
                 print("⚠ Phoenix server didn't start in time")
@@ -88,64 +109,49 @@ def test_with_phoenix():
     print()
     
     # Initialize RAG system with tracing
-    print("-"*60)
-    print("Initializing RAG system with Phoenix tracing...")
-    print("-"*60)
+    banner("Initializing RAG system with Phoenix tracing...", "-")
     
     # Tracing already enabled at import time
     print("✓ Tracing enabled:")
-    print(f"  LANGCHAIN_TRACING_V2={os.getenv('LANGCHAIN_TRACING_V2')}")
-    print(f"  LANGCHAIN_ENDPOINT={os.getenv('LANGCHAIN_ENDPOINT')}")
+    print(f"  LANGCHAIN_TRACING_V2={TRACING_ENV['LANGCHAIN_TRACING_V2']}")
+    print(f"  LANGCHAIN_ENDPOINT={TRACING_ENV['LANGCHAIN_ENDPOINT']}")
     print()
     
+    # Imported only now so Phoenix starts without waiting for LangChain and
+    # ChromaDB to load; tracing is configured above, before this first import
+    from tests._rag_factory import build_rag_from_env, llm_env, warmup
+    
     # Default to LM Studio (system default)
-    api_key = os.getenv("OPENAI_API_KEY")
-    use_local = os.getenv("USE_LOCAL_LLM", "false").lower() == "true"
-    local_base_url = os.getenv("LOCAL_LLM_BASE_URL", "http://localhost:1234/v1")  # Default to LM Studio
+    env = llm_env()
     
     print("🔧 LLM Configuration:")
     print("  Default: LM Studio at http://localhost:1234/v1")
     
     # Use LM Studio by default unless overridden
-    if not api_key and not use_local:
-        # Default: LM Studio
-        model_name = os.getenv("LOCAL_LLM_MODEL", "local-model")
-        print(f"  Using: LM Studio at {local_base_url}")
-        print(f"  Model: {model_name}")
+    if env.backend == "lm_studio":
+        print(f"  Using: LM Studio at {env.local_base_url}")
+        print(f"  Model: {env.local_model}")
         print()
         print("💡 Make sure LM Studio is running with a model loaded!")
-        print(f"   Verify: curl {local_base_url}/models")
+        print(f"   Verify: curl {env.local_base_url}/models")
         print()
-        
-        rag = GameTheoryRAG(
-            local_llm_base_url=local_base_url,
-            local_llm_model=model_name,
-            openai_api_key="lm-studio"
-        )
-    elif use_local:
+    elif env.backend == "ollama":
         print("  Using: Ollama")
-        rag = GameTheoryRAG(use_local_llm=True)
-    elif api_key:
-        print("  Using: OpenAI API")
-        rag = GameTheoryRAG(openai_api_key=api_key)
     else:
-        print("✗ Configuration error")
-        return
+        print("  Using: OpenAI API")
     
-    print("\n" + "="*60)
-    print("Running Test Query (check Phoenix UI for traces)")
-    print("="*60)
-    print()
+    rag = build_rag_from_env()
+    
+    banner("Running Test Query (check Phoenix UI for traces)", blank_before=True, blank_after=True)
     
     test_query = "What is game theory?"
+    warmup(rag, [test_query])
     print(f"Query: {test_query}")
     print()
     
     try:
         response = rag.query(test_query)
-        print(f"\n{'─'*60}")
-        print("RESPONSE:")
-        print(f"{'─'*60}")
+        banner("RESPONSE:", "─", blank_before=True)
         print(response)
         print()
         print(f"\n{'─'*60}")
@@ -156,7 +162,7 @@ def test_with_phoenix():
         
         if phoenix_process:
             print("\n💡 Phoenix server is running in background")
-            print("   Press Ctrl+C to stop it when done")
+            print(f"   Stop it when done with: kill {phoenix_process.pid}")
     except Exception as e:
         print(f"\n✗ Error processing query: {e}")
         import traceback
@@ -177,5 +183,7 @@ def test_with_phoenix():
 
 
 if __name__ == "__main__":
+    # Show the workflow's node and routing trace
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     test_with_phoenix()
 
@@ -9,9 +9,15 @@ from src.arxiv_search import ArxivSearcher
 class TestArxivSearcher(unittest.TestCase):
     """Test cases for ArxivSearcher class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.searcher = ArxivSearcher(max_results=1)
+    @classmethod
+    def setUpClass(cls):
+        """Set up a searcher shared by all tests (they only read from it)."""
+        cls.searcher = ArxivSearcher(max_results=1)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Release the shared searcher."""
+        del cls.searcher
     
     def test_initialization(self):
         """Test that arxiv searcher initializes correctly."""
@@ -31,7 +37,7 @@ class TestArxivSearcher(unittest.TestCase):
         
         # Configure mock to return our result
         mock_search_instance = Mock()
-        mock_search_instance.results.return_value = [mock_result]
+        mock_search_instance.results.return_value = iter([mock_result])
         mock_search.return_value = mock_search_instance
         
         # Test search
@@ -47,6 +53,23 @@ class TestArxivSearcher(unittest.TestCase):
         self.assertIn("pdf_url", paper)
         self.assertIn("entry_id", paper)
     
+    @patch('arxiv.Search')
+    def test_search_papers_stops_at_max_results(self, mock_search):
+        """Test that no more than max_results results are consumed."""
+        def results():
+            for i in range(3):
+                result = Mock(title=f"Paper {i}", authors=[])
+                result.published.strftime.return_value = "2024-01-01"
+                yield result
+        
+        generator = results()
+        mock_search.return_value.results.return_value = generator
+        
+        papers = self.searcher.search_papers("game theory")
+        
+        self.assertEqual([paper["title"] for paper in papers], ["Paper 0"])
+        self.assertEqual(next(generator).title, "Paper 1")
+    
     def test_max_results_setting(self):
         """Test that max_results can be configured."""
         searcher = ArxivSearcher(max_results=5)
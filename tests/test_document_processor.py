@@ -2,28 +2,34 @@
 Unit tests for document processor.
 """
 import unittest
-from src.document_processor import DocumentProcessor
+from src.document_processor import DocumentProcessor, TextSplitter
+
+
+# Sample texts, built once for the module
+SMALL_TEXT = "This is a small text."
+LARGE_TEXT = "A" * 250  # Text larger than chunk_size (100)
+# Distinct words, so a chunk's tail matches only where it really overlaps
+DISTINCT_WORDS_TEXT = " ".join(f"w{i}" for i in range(100))
 
 
 class TestDocumentProcessor(unittest.TestCase):
     """Test cases for DocumentProcessor class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.processor = DocumentProcessor(chunk_size=100, chunk_overlap=20)
+    @classmethod
+    def setUpClass(cls):
+        """Set up a processor shared by all tests (it is read-only after init)."""
+        cls.processor = DocumentProcessor(chunk_size=100, chunk_overlap=20)
     
     def test_chunk_small_text(self):
         """Test chunking of text smaller than chunk size."""
-        text = "This is a small text."
-        chunks = self.processor.chunk_text(text)
+        chunks = self.processor.chunk_text(SMALL_TEXT)
         
         self.assertEqual(len(chunks), 1)
-        self.assertEqual(chunks[0], text)
+        self.assertEqual(chunks[0], SMALL_TEXT)
     
     def test_chunk_large_text(self):
         """Test chunking of text larger than chunk size."""
-        text = "A" * 250  # Text larger than chunk_size (100)
-        chunks = self.processor.chunk_text(text)
+        chunks = self.processor.chunk_text(LARGE_TEXT)
         
         self.assertGreater(len(chunks), 1)
         for chunk in chunks:
@@ -53,18 +59,69 @@ class TestDocumentProcessor(unittest.TestCase):
         self.assertEqual(first_chunk["metadata"]["title"], "Test Paper")
         self.assertEqual(first_chunk["metadata"]["authors"], "Author One, Author Two")
     
+    def test_process_paper_builds_paper_metadata_once(self):
+        """Test that chunks of one paper share metadata built once."""
+        paper = dict(
+            self._papers()[1],
+            authors=["Author One", "Author Two"],
+            pdf_url="http://example.com/paper.pdf"
+        )
+        chunks = self.processor.process_paper(paper)
+        
+        self.assertGreater(len(chunks), 1)
+        first, second = chunks[0]["metadata"], chunks[1]["metadata"]
+        # Authors are joined once per paper, not once per chunk
+        self.assertIs(first["authors"], second["authors"])
+        self.assertEqual(first["pdf_url"], second["pdf_url"])
+        self.assertEqual([c["metadata"]["chunk_index"] for c in chunks], list(range(len(chunks))))
+    
     def test_chunk_overlap(self):
         """Test that chunks have proper overlap."""
-        text = "word " * 100  # Create text with repeated words
-        chunks = self.processor.chunk_text(text)
+        chunks = self.processor.chunk_text(DISTINCT_WORDS_TEXT)
+        n = self.processor.chunk_overlap
         
-        if len(chunks) > 1:
-            # Check that there's some overlap between consecutive chunks
-            for i in range(len(chunks) - 1):
-                # Last part of current chunk should appear in next chunk
-                self.assertTrue(len(chunks[i]) > 0)
-                self.assertTrue(len(chunks[i+1]) > 0)
-
+        self.assertGreater(len(chunks), 1)
+        for i in range(len(chunks) - 1):
+            # The next chunk starts with the last chunk_overlap characters of
+            # this one (stripped, as chunks are)
+            a_tail = chunks[i][-n:].strip()
+            self.assertTrue(
+                chunks[i+1].startswith(a_tail),
+                f"chunk {i+1} {chunks[i+1][:n]!r} does not start with {a_tail!r}"
+            )
+    
+    def _papers(self):
+        """Build two papers, one long enough to need several chunks."""
+        return [
+            {
+                "title": f"Paper {i}",
+                "summary": "Players choose strategies. " * (20 * i + 1),
+                "authors": ["Author One"],
+                "published": "2024-01-01",
+                "entry_id": f"arxiv:{i}"
+            }
+            for i in range(2)
+        ]
+    
+    def test_process_papers_matches_process_paper(self):
+        """Test that batch processing returns the same chunks per paper."""
+        papers = self._papers()
+        batched = self.processor.process_papers(papers)
+        
+        self.assertEqual(batched, [self.processor.process_paper(p) for p in papers])
+    
+    @unittest.skipIf(TextSplitter is None, "semantic-text-splitter not installed")
+    def test_process_papers_fast_splitter(self):
+        """Test the semantic-text-splitter fast path."""
+        processor = DocumentProcessor(chunk_size=100, chunk_overlap=20, use_fast_splitter=True)
+        batched = processor.process_papers(self._papers())
+        
+        self.assertEqual(len(batched), 2)
+        self.assertEqual(len(batched[0]), 1)
+        self.assertGreater(len(batched[1]), 1)
+        for chunk in batched[1]:
+            self.assertLessEqual(len(chunk["text"]), 100)
+        self.assertEqual(batched[1][0]["id"], "arxiv:1_chunk_0")
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,183 @@
+"""
+Unit tests for LLM batcher.
+"""
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import ANY, Mock, patch
+from langchain_core.runnables import RunnableLambda
+from src.llm_batcher import LLMBatcher
+
+
+class TestLLMBatcher(unittest.TestCase):
+    """Test cases for LLMBatcher class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.llm = Mock()
+        self.llm.invoke.side_effect = lambda prompt, config=None: f"reply to {prompt}"
+        self.llm.batch.side_effect = lambda prompts, config=None, return_exceptions=False: [
+            f"reply to {prompt}" for prompt in prompts
+        ]
+    
+    def _hold_first_call(self, batcher, prompt):
+        """
+        Start a call to prompt that blocks inside llm.invoke.
+        
+        Returns the thread making the call and an Event that lets it finish.
+        Requests submitted meanwhile queue up for the next batch.
+        """
+        started, release = threading.Event(), threading.Event()
+        
+        def held_reply(prompt, config=None):
+            started.set()
+            release.wait(5)
+            return f"reply to {prompt}"
+        
+        self.llm.invoke.side_effect = held_reply
+        thread = threading.Thread(target=batcher.invoke, args=(prompt,))
+        thread.start()
+        self.assertTrue(started.wait(5))
+        return thread, release
+    
+    def _wait_for_queue(self, batcher, size):
+        """Wait until size requests are queued for the worker."""
+        deadline = time.monotonic() + 5
+        while batcher._queue.qsize() < size:
+            self.assertLess(time.monotonic(), deadline, "requests were not queued")
+            time.sleep(0.001)
+    
+    def test_single_invoke(self):
+        """Test that a lone request is answered with a plain invoke call."""
+        batcher = LLMBatcher(self.llm, wait_ms=0)
+        self.assertEqual(batcher.invoke("a"), "reply to a")
+        self.llm.invoke.assert_called_once_with("a", config=ANY)
+        self.llm.batch.assert_not_called()
+    
+    def test_single_invoke_does_not_wait(self):
+        """Test that a lone request is sent without waiting for others."""
+        batcher = LLMBatcher(self.llm, wait_ms=5000)
+        start = time.monotonic()
+        self.assertEqual(batcher.invoke("a"), "reply to a")
+        self.assertLess(time.monotonic() - start, 1)
+    
+    def test_concurrent_requests_are_batched(self):
+        """Test that requests queued together share one batch call."""
+        batcher = LLMBatcher(self.llm, wait_ms=50)
+        first, release = self._hold_first_call(batcher, "q0")
+        prompts = [f"q{i}" for i in range(1, 4)]
+        results = {}
+        
+        def submit(prompt):
+            results[prompt] = batcher.invoke(prompt)
+        
+        threads = [threading.Thread(target=submit, args=(p,)) for p in prompts]
+        for thread in threads:
+            thread.start()
+        self._wait_for_queue(batcher, len(prompts))
+        release.set()
+        for thread in [first] + threads:
+            thread.join()
+        
+        self.assertEqual(results, {p: f"reply to {p}" for p in prompts})
+        self.llm.batch.assert_called_once()
+        self.assertCountEqual(self.llm.batch.call_args[0][0], prompts)
+    
+    def test_ainvoke_shares_batch(self):
+        """Test that queued async requests share one batch call."""
+        batcher = LLMBatcher(self.llm, wait_ms=50)
+        first, release = self._hold_first_call(batcher, "first")
+        
+        async def run():
+            calls = asyncio.gather(batcher.ainvoke("a"), batcher.ainvoke("b"))
+            await asyncio.to_thread(self._wait_for_queue, batcher, 2)
+            release.set()
+            return await calls
+        
+        self.assertEqual(asyncio.run(run()), ["reply to a", "reply to b"])
+        first.join()
+        self.llm.batch.assert_called_once()
+    
+    def test_caller_config_reaches_llm(self):
+        """Test that the caller's run config is passed to the LLM call."""
+        batcher = LLMBatcher(self.llm, wait_ms=0)
+        node = RunnableLambda(lambda prompt: batcher.invoke(prompt))
+        
+        self.assertEqual(node.invoke("a", config={"tags": ["outer"]}), "reply to a")
+        config = self.llm.invoke.call_args.kwargs["config"]
+        self.assertIn("outer", config["tags"])
+        self.assertIsNotNone(config["callbacks"])
+    
+    def test_exception_is_raised_to_caller(self):
+        """Test that an LLM error is raised from invoke."""
+        self.llm.invoke.side_effect = RuntimeError("boom")
+        batcher = LLMBatcher(self.llm, wait_ms=0)
+        with self.assertRaises(RuntimeError):
+            batcher.invoke("a")
+    
+    def test_cancelled_call_does_not_stop_worker(self):
+        """Test that cancelling an awaited call leaves the batcher usable."""
+        def slow_reply(prompt, config=None):
+            time.sleep(0.2)
+            return f"reply to {prompt}"
+        
+        self.llm.invoke.side_effect = slow_reply
+        batcher = LLMBatcher(self.llm, wait_ms=0)
+        
+        async def run():
+            # Times out while the LLM call is in flight
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(batcher.ainvoke("a"), timeout=0.05)
+            return await asyncio.wait_for(batcher.ainvoke("b"), timeout=5)
+        
+        self.assertEqual(asyncio.run(run()), "reply to b")
+    
+    def test_max_tokens_passed_to_llm(self):
+        """Test that max_tokens is forwarded on every LLM call."""
+        self.llm.invoke.side_effect = None
+        batcher = LLMBatcher(self.llm, wait_ms=0, max_tokens=1)
+        batcher.invoke("a")
+        self.llm.invoke.assert_called_once_with("a", config=ANY, max_tokens=1)
+    
+    def test_for_llm_shares_instance(self):
+        """Test that for_llm returns one batcher per LLM instance."""
+        self.assertIs(LLMBatcher.for_llm(self.llm), LLMBatcher.for_llm(self.llm))
+        self.assertIsNot(LLMBatcher.for_llm(self.llm), LLMBatcher.for_llm(Mock()))
+    
+    def test_close_stops_worker(self):
+        """Test that close stops the worker and a later call restarts it."""
+        batcher = LLMBatcher(self.llm, wait_ms=0)
+        batcher.invoke("a")
+        worker = batcher._worker
+        
+        batcher.close()
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(batcher.invoke("b"), "reply to b")
+    
+    @patch.object(LLMBatcher, "_MAX_SHARED", 2)
+    @patch.dict(LLMBatcher._shared, clear=True)
+    def test_for_llm_evicts_oldest(self):
+        """Test that the shared batchers are bounded and evicted ones closed."""
+        oldest = LLMBatcher.for_llm(self.llm)
+        oldest.invoke("a")
+        worker = oldest._worker
+        LLMBatcher.for_llm(Mock())
+        LLMBatcher.for_llm(Mock())
+        
+        self.assertEqual(len(LLMBatcher._shared), 2)
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+        self.assertIsNot(LLMBatcher.for_llm(self.llm), oldest)
+    
+    def test_invalid_settings(self):
+        """Test that invalid batch settings are rejected."""
+        with self.assertRaises(ValueError):
+            LLMBatcher(self.llm, max_batch=0)
+        with self.assertRaises(ValueError):
+            LLMBatcher(self.llm, wait_ms=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
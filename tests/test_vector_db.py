@@ -1,31 +1,151 @@
 """
 Unit tests for vector database manager.
 """
+import hashlib
+import os
 import unittest
 import tempfile
+import threading
 import shutil
-from src.vector_db import VectorDBManager
+from unittest.mock import Mock, patch
+import pytest
+from chromadb.api.types import EmbeddingFunction
+from src.vector_db import VectorDBManager, default_persist_directory, release_clients
+
+
+# Put test databases on tmpfs (Linux) so ChromaDB's SQLite and index writes
+# never wait on disk syncs. An explicit TMPDIR takes precedence.
+TEST_TMP_ROOT = (
+    "/dev/shm"
+    if not os.environ.get("TMPDIR") and os.access("/dev/shm", os.W_OK)
+    else None
+)
+
+
+class HashEmbedding(EmbeddingFunction):
+    """
+    Deterministic stand-in for the sentence-transformer embedder.
+    
+    Maps each text to the 32 bytes of its SHA-256 digest, scaled to [0, 1].
+    Distinct texts get distinct vectors, which is all the wiring tests need;
+    the vectors carry no meaning.
+    """
+    
+    def __init__(self):
+        pass
+    
+    @staticmethod
+    def name():
+        return "test-hash"
+    
+    def get_config(self):
+        return {}
+    
+    @staticmethod
+    def build_from_config(config):
+        return HashEmbedding()
+    
+    def __call__(self, input):
+        return [
+            [byte / 255 for byte in hashlib.sha256(text.encode()).digest()]
+            for text in input
+        ]
 
 
 class TestVectorDBManager(unittest.TestCase):
     """Test cases for VectorDBManager class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        # Create temporary directory for test database
-        self.test_dir = tempfile.mkdtemp()
-        self.db_manager = VectorDBManager(persist_directory=self.test_dir)
+    @classmethod
+    def setUpClass(cls):
+        """Open one database for the whole class (loading Chroma is slow)."""
+        # Create temporary directory for test database, named per xdist worker
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+        cls.test_dir = tempfile.mkdtemp(prefix=f"chroma_{worker}_", dir=TEST_TMP_ROOT)
+        # Hash embeddings keep the embedding model out of the unit tests
+        cls.shared_db_manager = VectorDBManager(
+            persist_directory=cls.test_dir,
+            embedding_function=HashEmbedding()
+        )
     
-    def tearDown(self):
-        """Clean up test fixtures."""
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the shared database."""
+        # Close the cached client before its files go away
+        release_clients()
         # Remove temporary directory
-        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+    
+    def setUp(self):
+        """Start each test with an empty database."""
+        self.db_manager = self.shared_db_manager
+        self.db_manager.clear()
+        self.db_manager._embedding_cache.clear()
+        # Some tests swap in mocks; put the real objects back afterwards
+        for attr in ("collection", "embedding_function"):
+            self.addCleanup(setattr, self.db_manager, attr, getattr(self.db_manager, attr))
     
     def test_initialization(self):
         """Test that vector DB initializes correctly."""
         self.assertIsNotNone(self.db_manager.client)
         self.assertIsNotNone(self.db_manager.collection)
     
+    def test_client_shared_per_directory(self):
+        """Test that managers on the same directory reuse one client."""
+        other = VectorDBManager(persist_directory=self.test_dir + os.sep, warm_up=False)
+        
+        self.assertIs(other.client, self.db_manager.client)
+    
+    def test_id_cache_shared_per_directory(self):
+        """Test that adds and clears through one manager are seen by another."""
+        other = VectorDBManager(
+            persist_directory=self.test_dir,
+            warm_up=False,
+            embedding_function=HashEmbedding()
+        )
+        
+        self.db_manager.add_documents(["Doc 1"], [{"source": "test"}], ["doc1"])
+        self.assertTrue(other.has_document("doc1"))
+        
+        other.clear()
+        self.assertFalse(self.db_manager.has_document("doc1"))
+        self.db_manager.add_documents(["Doc 1"], [{"source": "test"}], ["doc1"])
+        self.assertEqual(other.count(), 1)
+    
+    def test_concurrent_adds_store_each_id_once(self):
+        """Test that writers on one directory never both insert the same ID."""
+        managers = [self.db_manager] + [
+            VectorDBManager(
+                persist_directory=self.test_dir,
+                warm_up=False,
+                embedding_function=HashEmbedding()
+            )
+            for _ in range(3)
+        ]
+        ids = [f"doc{i}" for i in range(20)]
+        sent = []
+        
+        def add(manager):
+            record = lambda **kwargs: sent.extend(kwargs["ids"])
+            with patch.object(manager.collection, "add", side_effect=record):
+                manager.add_documents(ids, [{"source": "test"}] * len(ids), ids)
+        
+        threads = [threading.Thread(target=add, args=(m,)) for m in managers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertCountEqual(sent, ids)
+    
+    def test_default_directory_per_xdist_worker(self):
+        """Test that the default directory is separate for each xdist worker."""
+        with patch.dict(os.environ, {"PYTEST_XDIST_WORKER": "gw3"}):
+            self.assertEqual(default_persist_directory(), "./chroma_db_gw3")
+        
+        with patch.dict(os.environ):
+            os.environ.pop("PYTEST_XDIST_WORKER", None)
+            self.assertEqual(default_persist_directory(), "./chroma_db")
+    
     def test_add_documents(self):
         """Test adding documents to the database."""
         documents = ["Document 1 content", "Document 2 content"]
@@ -38,6 +158,24 @@ class TestVectorDBManager(unittest.TestCase):
         count = self.db_manager.count()
         self.assertEqual(count, 2)
     
+    def test_add_documents_embeds_in_one_call(self):
+        """Test that a batch of documents is embedded with a single model call."""
+        n = 32
+        embedder_type = type(self.db_manager.embedding_function)
+        
+        with patch.object(
+            embedder_type, "__call__", autospec=True,
+            side_effect=embedder_type.__call__
+        ) as embed:
+            self.db_manager.add_documents(
+                [f"Document {i} content" for i in range(n)],
+                [{"source": "test"}] * n,
+                [f"doc{i}" for i in range(n)]
+            )
+        
+        self.assertEqual(embed.call_count, 1)
+        self.assertEqual(self.db_manager.count(), n)
+    
     def test_query_documents(self):
         """Test querying documents from the database."""
         # Add some documents first
@@ -58,6 +196,54 @@ class TestVectorDBManager(unittest.TestCase):
         self.assertIn("documents", results)
         self.assertEqual(len(results["documents"][0]), 2)
     
+    def test_query_batch(self):
+        """Test querying with several query strings in one call."""
+        documents = [
+            "Game theory is a mathematical framework",
+            "Nash equilibrium is a key concept",
+            "The weather is sunny today"
+        ]
+        metadatas = [{"source": f"test{i}"} for i in range(3)]
+        ids = [f"doc{i}" for i in range(3)]
+        
+        self.db_manager.add_documents(documents, metadatas, ids)
+        
+        results = self.db_manager.query_batch(["game theory", "weather"], n_results=1)
+        
+        # One result list per query string
+        self.assertEqual(len(results["documents"]), 2)
+        self.assertEqual(len(results["documents"][0]), 1)
+        self.assertEqual(len(results["documents"][1]), 1)
+    
+    def test_embed_query_cached(self):
+        """Test that repeated queries reuse the cached embedding."""
+        self.db_manager.embedding_function = Mock(return_value=[[0.1, 0.2]])
+        
+        first = self.db_manager.embed_query("Nash equilibrium")
+        second = self.db_manager.embed_query("Nash equilibrium")
+        
+        self.assertEqual(first, [0.1, 0.2])
+        self.assertIs(first, second)
+        self.db_manager.embedding_function.assert_called_once_with(["Nash equilibrium"])
+    
+    def test_embed_queries_batches_uncached(self):
+        """Test that only uncached queries are embedded, in one call."""
+        self.db_manager.embedding_function = Mock(return_value=[[0.1, 0.2]])
+        self.db_manager.embed_query("Nash equilibrium")
+        self.db_manager.embedding_function = Mock(return_value=[[0.3, 0.4], [0.5, 0.6]])
+        
+        embeddings = self.db_manager.embed_queries(
+            ["Nash equilibrium", "Pareto efficiency", "Shapley value", "Pareto efficiency"]
+        )
+        
+        self.assertEqual(
+            embeddings,
+            [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6], [0.3, 0.4]]
+        )
+        self.db_manager.embedding_function.assert_called_once_with(
+            ["Pareto efficiency", "Shapley value"]
+        )
+    
     def test_empty_query(self):
         """Test querying an empty database."""
         results = self.db_manager.query("test query", n_results=3)
@@ -67,6 +253,56 @@ class TestVectorDBManager(unittest.TestCase):
         # Empty database should return empty results
         self.assertEqual(len(results["documents"][0]), 0)
     
+    def test_add_documents_skips_existing_ids(self):
+        """Test that IDs already in the collection are not re-added."""
+        self.db_manager._id_cache.update({"doc1", "doc2"})
+        self.db_manager.collection = Mock()
+        
+        self.db_manager.add_documents(
+            ["Doc 1", "Doc 2", "Doc 3", "Doc 3"],
+            [{"source": "test"}] * 4,
+            ["doc1", "doc2", "doc3", "doc3"]
+        )
+        
+        # Only the unseen ID is sent to Chroma, once
+        self.db_manager.collection.add.assert_called_once_with(
+            documents=["Doc 3"],
+            metadatas=[{"source": "test"}],
+            ids=["doc3"]
+        )
+        
+        # A fully duplicate batch never reaches Chroma
+        self.db_manager.collection.add.reset_mock()
+        self.db_manager.add_documents(["Doc 1"], [{"source": "test"}], ["doc1"])
+        self.db_manager.collection.add.assert_not_called()
+    
+    def test_has_document(self):
+        """Test that has_document reflects added IDs without querying Chroma."""
+        self.db_manager.collection = Mock()
+        self.assertFalse(self.db_manager.has_document("doc1"))
+        
+        self.db_manager.add_documents(["Doc 1"], [{"source": "test"}], ["doc1"])
+        
+        self.assertTrue(self.db_manager.has_document("doc1"))
+        self.db_manager.collection.get.assert_not_called()
+    
+    def test_clear(self):
+        """Test that clear removes all documents and forgets their IDs."""
+        self.db_manager.add_documents(
+            ["Doc 1", "Doc 2"],
+            [{"source": "test"}] * 2,
+            ["doc1", "doc2"]
+        )
+        
+        self.db_manager.clear()
+        
+        self.assertEqual(self.db_manager.count(), 0)
+        self.assertFalse(self.db_manager.has_document("doc1"))
+        
+        # Cleared IDs can be added again
+        self.db_manager.add_documents(["Doc 1"], [{"source": "test"}], ["doc1"])
+        self.assertEqual(self.db_manager.count(), 1)
+    
     def test_add_documents_validation(self):
         """Test that add_documents validates input lengths."""
         documents = ["Doc 1", "Doc 2"]
@@ -79,5 +315,35 @@ class TestVectorDBManager(unittest.TestCase):
         self.assertIn("same length", str(context.exception))
 
 
+@pytest.mark.slow
+class TestVectorDBManagerRealEmbeddings(unittest.TestCase):
+    """Checks that need the real embedding model (run with: pytest -m slow)."""
+    
+    def setUp(self):
+        """Create a database with the default embedder."""
+        self.test_dir = tempfile.mkdtemp(dir=TEST_TMP_ROOT)
+        # Cleanups run last-in first-out: release the client, then delete
+        self.addCleanup(shutil.rmtree, self.test_dir, ignore_errors=True)
+        self.addCleanup(release_clients)
+        self.db_manager = VectorDBManager(persist_directory=self.test_dir, warm_up=False)
+    
+    def test_query_ranks_related_documents_first(self):
+        """Test that semantic search ranks the related documents first."""
+        documents = [
+            "Game theory is a mathematical framework",
+            "Nash equilibrium is a key concept",
+            "The weather is sunny today"
+        ]
+        metadatas = [{"source": f"test{i}"} for i in range(3)]
+        ids = [f"doc{i}" for i in range(3)]
+        
+        self.db_manager.add_documents(documents, metadatas, ids)
+        
+        results = self.db_manager.query("game theory", n_results=2)
+        
+        self.assertEqual(results["ids"][0][0], "doc0")
+        self.assertNotIn("doc2", results["ids"][0])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,24 +3,30 @@ Verification script to check all components are working correctly.
 This script can run without an API key to verify the structure.
 """
 
+# Import everything once; the checks below use these names
+try:
+    from src.vector_db import VectorDBManager
+    from src.arxiv_search import ArxivSearcher
+    from src.document_processor import DocumentProcessor
+    from src.workflow import GameTheoryRAG, GraphState
+    _IMPORT_ERROR = None
+except ImportError as e:
+    _IMPORT_ERROR = e
+
+
 def test_imports():
     """Test that all modules can be imported."""
     print("Testing imports...")
-    try:
-        from src.vector_db import VectorDBManager
-        from src.arxiv_search import ArxivSearcher
-        from src.document_processor import DocumentProcessor
-        print("✓ All core modules import successfully")
-        return True
-    except ImportError as e:
-        print(f"✗ Import error: {e}")
+    if _IMPORT_ERROR is not None:
+        print(f"✗ Import error: {_IMPORT_ERROR}")
         return False
+    print("✓ All core modules import successfully")
+    return True
 
 
 def test_document_processor():
     """Test document processor functionality."""
     print("\nTesting document processor...")
-    from src.document_processor import DocumentProcessor
     
     processor = DocumentProcessor(chunk_size=100, chunk_overlap=20)
     
@@ -46,7 +52,6 @@ def test_document_processor():
 def test_arxiv_searcher():
     """Test arxiv searcher initialization."""
     print("\nTesting arxiv searcher...")
-    from src.arxiv_search import ArxivSearcher
     
     searcher = ArxivSearcher(max_results=2)
     print(f"✓ Arxiv searcher initialized with max_results={searcher.max_results}")
@@ -57,14 +62,9 @@ def test_arxiv_searcher():
 def test_workflow_structure():
     """Test workflow can be imported (requires API key to run)."""
     print("\nTesting workflow structure...")
-    try:
-        from src.workflow import GameTheoryRAG, GraphState
-        print("✓ Workflow module imports successfully")
-        print("  Note: Running the workflow requires OPENAI_API_KEY in .env")
-        return True
-    except ImportError as e:
-        print(f"✗ Workflow import error: {e}")
-        return False
+    print(f"✓ Workflow module imports successfully ({GameTheoryRAG.__name__}, {GraphState.__name__})")
+    print("  Note: Running the workflow requires OPENAI_API_KEY in .env")
+    return True
 
 
 def main():
@@ -74,13 +74,15 @@ def main():
     print("="*60)
     
     tests = [
-        test_imports,
         test_document_processor,
         test_arxiv_searcher,
         test_workflow_structure
     ]
     
-    results = [test() for test in tests]
+    # The other checks need the imports; skip them if those failed
+    results = [test_imports()]
+    if results[0]:
+        results += [test() for test in tests]
     
     print("\n" + "="*60)
     if all(results):
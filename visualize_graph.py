@@ -1,46 +1,93 @@
 """
 Visualize the LangGraph workflow.
+
+Usage:
+    python visualize_graph.py          # Reuse workflow_diagram.mmd if up to date
+    python visualize_graph.py --force  # Always rebuild the diagrams
 """
+import importlib.util
 import os
-from dotenv import load_dotenv
-from src.workflow import GameTheoryRAG
+import shutil
+import subprocess
+import sys
+
 
+MERMAID_FILE = "workflow_diagram.mmd"
+PNG_FILE = "workflow_diagram.png"
+# The graph topology is defined here; a diagram newer than it is current
+WORKFLOW_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "workflow.py")
 
-def visualize_graph():
-    """Generate visualization of the LangGraph workflow."""
-    load_dotenv()
+
+def _cached_mermaid():
+    """
+    Return the saved Mermaid diagram if it is newer than the workflow source.
     
-    # Try to initialize with local LLM first (doesn't need API key)
+    Returns:
+        Diagram text, or None if it is missing or older than src/workflow.py.
+    """
     try:
-        print("Attempting to use local LLM for visualization...")
-        rag = GameTheoryRAG(use_local_llm=True)
-    except Exception as e:
-        print(f"Could not use local LLM: {e}")
-        # Try with OpenAI API key
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            print("Using OpenAI API key for visualization...")
-            rag = GameTheoryRAG(openai_api_key=api_key)
-        else:
-            print("Warning: No API key or local LLM available.")
-            print("Creating dummy LLM for visualization only...")
-            # Create a minimal mock just for graph structure
-            from langchain_core.language_models import BaseChatModel
-            from langchain_core.messages import BaseMessage
-            
-            class DummyLLM(BaseChatModel):
-                def _generate(self, messages, stop=None, run_manager=None, **kwargs):
-                    from langchain_core.outputs import ChatGeneration, ChatResult
-                    return ChatResult(generations=[ChatGeneration(message=BaseMessage(content="yes"))])
-                
-                @property
-                def _llm_type(self):
-                    return "dummy"
-            
-            rag = GameTheoryRAG(llm=DummyLLM())
+        if os.path.getmtime(MERMAID_FILE) < os.path.getmtime(WORKFLOW_SOURCE):
+            return None
+        with open(MERMAID_FILE) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def save_png(graph):
+    """
+    Render the diagram to PNG with a local renderer, if one is installed.
+    
+    Uses pyppeteer (headless Chromium) or the Mermaid CLI (mmdc). With
+    neither installed nothing is attempted, so minimal environments skip
+    the browser start-up or remote call that would only fail.
+    
+    Args:
+        graph: Drawable workflow graph; MERMAID_FILE must already be saved.
+    """
+    if importlib.util.find_spec("pyppeteer"):
+        from langchain_core.runnables.graph import MermaidDrawMethod
+        graph.draw_mermaid_png(
+            output_file_path=PNG_FILE,
+            draw_method=MermaidDrawMethod.PYPPETEER
+        )
+    elif shutil.which("mmdc"):
+        subprocess.run(["mmdc", "-i", MERMAID_FILE, "-o", PNG_FILE], check=True)
+    else:
+        print("Note: install mmdc or pyppeteer to enable PNG rendering")
+        print("  Use the Mermaid file with an online viewer or VS Code extension")
+        return
+    print(f"✓ Saved PNG diagram to {PNG_FILE}")
+
+
+def get_workflow_graph():
+    """
+    Build the drawable workflow graph without loading any models.
+    
+    Returns:
+        langchain_core Graph for the compiled workflow (nodes and edges only).
+    """
+    from src.workflow import GameTheoryRAG
+    return GameTheoryRAG.graph_only().compile().get_graph()
+
+
+def visualize_graph(force: bool = False):
+    """
+    Generate visualization of the LangGraph workflow.
+    
+    Args:
+        force: Rebuild the diagrams even if workflow_diagram.mmd is up to date.
+    """
+    if not force:
+        mermaid_diagram = _cached_mermaid()
+        if mermaid_diagram is not None:
+            print(f"Mermaid Diagram (cached in {MERMAID_FILE}; --force to rebuild):")
+            print("-" * 60)
+            print(mermaid_diagram)
+            return
     
     # Get the compiled graph for visualization (has draw_mermaid method)
-    graph = rag.workflow.get_graph()
+    graph = get_workflow_graph()
     
     print("\n" + "="*60)
     print("LangGraph Workflow Visualization")
@@ -68,29 +115,17 @@ def visualize_graph():
         print(mermaid_diagram)
         
         # Save Mermaid diagram to file
-        mermaid_file = "workflow_diagram.mmd"
+        mermaid_file = MERMAID_FILE
         with open(mermaid_file, "w") as f:
             f.write(mermaid_diagram)
         print(f"\n✓ Saved Mermaid diagram to {mermaid_file}")
         print(f"  You can view it at https://mermaid.live/ or in any Mermaid-compatible viewer")
         
-        # Try to generate PNG if possible
+        # Generate PNG only when a renderer is available
         try:
-            png_data = graph.draw_mermaid_png()
-            if png_data:
-                # draw_mermaid_png returns bytes, save to file
-                png_file = "workflow_diagram.png"
-                if isinstance(png_data, bytes):
-                    with open(png_file, "wb") as f:
-                        f.write(png_data)
-                    print(f"✓ Saved PNG diagram to {png_file}")
-                elif isinstance(png_data, str):
-                    # If it returns a path, just report it
-                    print(f"✓ PNG diagram at {png_data}")
-                else:
-                    print(f"Note: PNG data format unexpected: {type(png_data)}")
+            save_png(graph)
         except Exception as e:
-            print(f"Note: PNG generation not available ({e})")
+            print(f"Note: PNG generation failed ({e})")
             print("  Use the Mermaid file with an online viewer or VS Code extension")
     except Exception as e:
         print(f"Error generating Mermaid diagram: {e}")
@@ -99,5 +134,5 @@ def visualize_graph():
 
 
 if __name__ == "__main__":
-    visualize_graph()
+    visualize_graph(force="--force" in sys.argv[1:])
 